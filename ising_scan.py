@@ -1,33 +1,309 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-import random
+from numba import njit, prange
+
+# Exact critical temperature of the 2D Ising model (Onsager)
+TC = 2 / math.log(1 + math.sqrt(2))
+
+
+def _acceptance_table(temperature):
+    """Metropolis acceptance probability for each possible energy difference (-8, -4, 0, 4, 8).
+
+    Works for a single temperature or an array of them (one row per temperature).
+    """
+    Ediff = np.array([-8, -4, 0, 4, 8])
+    temperature = np.asarray(temperature, dtype=float)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(Ediff <= 0, 1.0, np.exp(-Ediff / temperature))
+
+
+def _grid_energy(grid):
+    """Energy -sum(s_i * s_j) over nearest-neighbor bonds, each bond counted once (right and down).
+
+    Works for a single grid or a stack of grids (one energy per grid).
+    """
+    return -np.sum(grid * (np.roll(grid, -1, axis=-2) + np.roll(grid, -1, axis=-1)), axis=(-2, -1))
+
+
+@njit(cache=True)
+def _refresh_halo(padded):
+    """Copy the opposite edges of the grid into the 1-cell halo (periodic boundary conditions)"""
+    n = padded.shape[0] - 2
+    for k in range(1, n + 1):
+        padded[0, k] = padded[n, k]
+        padded[n + 1, k] = padded[1, k]
+        padded[k, 0] = padded[k, n]
+        padded[k, n + 1] = padded[k, 1]
+
+
+@njit(cache=True, fastmath=True)
+def _sweep(padded, p_accept, rand_order_i, rand_order_j, rand_u):
+    """Metropolis sweep over the sites in the given order, returns the change in total spin and energy.
+
+    Works on the halo-padded grid, so sites are indexed 1..n and neighbors need no modulo.
+    """
+    n = padded.shape[0] - 2
+    delta_sum = 0
+    delta_energy = 0
+    _refresh_halo(padded)
+
+    for k in range(rand_order_i.shape[0]):
+        i = rand_order_i[k]
+        j = rand_order_j[k]
+        current_spin = padded[i, j]
+        neighbors_sum = padded[i - 1, j] + padded[i + 1, j] + padded[i, j - 1] + padded[i, j + 1]
+
+        # Metropolis criterion via the table (Ediff = 2 * spin * neighbors_sum), without branches
+        flip = rand_u[k] < p_accept[(current_spin * neighbors_sum) // 2 + 2]
+        new_spin = current_spin * (1 - 2 * flip)
+        padded[i, j] = new_spin
+        delta_sum -= 2 * current_spin * flip
+        delta_energy += 2 * current_spin * neighbors_sum * flip
+
+        # Keep the halo in sync when an edge site changes
+        if i == 1:
+            padded[n + 1, j] = new_spin
+        elif i == n:
+            padded[0, j] = new_spin
+        if j == 1:
+            padded[i, n + 1] = new_spin
+        elif j == n:
+            padded[i, 0] = new_spin
+
+    return delta_sum, delta_energy
+
+
+# Tile edge for the sequential sweep: (TILE + 2)^2 int8 spins = 16 KB, half of a typical L1 cache
+TILE = 126
+
+
+def _make_sweep_tiled(n):
+    """Build the sequential sweep kernel for n x n grids.
+
+    Numba freezes the closure variable n into the compiled code, so the loop bounds and the
+    edge checks are compile-time constants.
+    """
+    @njit(cache=True, fastmath=True)
+    def sweep_tiled(padded, p_accept, rand_u, tile):
+        """Sequential Metropolis sweep visiting the grid tile by tile, returns the change in total spin and energy.
+
+        All spins of a tile are updated before moving on, so the rows it touches stay in L1 cache.
+        Tiles advance along the rows first, following the row-major layout.
+        """
+        delta_sum = 0
+        delta_energy = 0
+        _refresh_halo(padded)
+
+        for ii in range(1, n + 1, tile):
+            for jj in range(1, n + 1, tile):
+                for i in range(ii, min(ii + tile, n + 1)):
+                    for j in range(jj, min(jj + tile, n + 1)):
+                        current_spin = padded[i, j]
+                        neighbors_sum = padded[i - 1, j] + padded[i + 1, j] + padded[i, j - 1] + padded[i, j + 1]
+
+                        # Same update as in _sweep (kept inline, a helper call is much slower here)
+                        flip = rand_u[(i - 1) * n + j - 1] < p_accept[(current_spin * neighbors_sum) // 2 + 2]
+                        new_spin = current_spin * (1 - 2 * flip)
+                        padded[i, j] = new_spin
+                        delta_sum -= 2 * current_spin * flip
+                        delta_energy += 2 * current_spin * neighbors_sum * flip
+
+                        if i == 1:
+                            padded[n + 1, j] = new_spin
+                        elif i == n:
+                            padded[0, j] = new_spin
+                        if j == 1:
+                            padded[i, n + 1] = new_spin
+                        elif j == n:
+                            padded[i, 0] = new_spin
+
+        return delta_sum, delta_energy
+
+    return sweep_tiled
+
+
+# Sequential sweep kernels by grid size, each compiled on first use
+_sweep_tiled_kernels = {}
+
+
+def _sweep_tiled_for(size):
+    """Sequential sweep kernel specialized for size x size grids"""
+    if size not in _sweep_tiled_kernels:
+        _sweep_tiled_kernels[size] = _make_sweep_tiled(size)
+    return _sweep_tiled_kernels[size]
+
+
+@njit(cache=True)
+def _sweep_bitpacked(padded, p_accept, rand_u):
+    """Checkerboard sweep on a bit-packed copy of the grid, returns the new total spin and energy.
+
+    Each row is packed into uint64 words (bit set = spin -1), so 64 sites are handled at once:
+    the number of disagreeing neighbors of every site is counted with XORs and a bitwise adder.
+    """
+    n = padded.shape[0] - 2
+    words = (n + 63) // 64
+    one = np.uint64(1)
+    top = np.uint64(63)
+    last_bit = np.uint64((n - 1) & 63)
+    all_ones = ~np.uint64(0)
+
+    # Valid bits of the last word of a row
+    last_mask = all_ones if n % 64 == 0 else (one << np.uint64(n % 64)) - one
+    # Sites with even / odd column index (64 is even, so the pattern is the same in every word)
+    parity_masks = (np.uint64(0x5555555555555555), np.uint64(0xAAAAAAAAAAAAAAAA))
+
+    bits = np.zeros((n, words), dtype=np.uint64)
+    for i in range(n):
+        for j in range(n):
+            if padded[i + 1, j + 1] < 0:
+                bits[i, j >> 6] |= one << np.uint64(j & 63)
+
+    left = np.empty(words, dtype=np.uint64)
+    right = np.empty(words, dtype=np.uint64)
+    p4 = p_accept[3]
+    p8 = p_accept[4]
+
+    for color in range(2):
+        for i in range(n):
+            row = bits[i]
+            up = bits[(i - 1) % n]
+            down = bits[(i + 1) % n]
+
+            # Rows shifted so that bit j holds the neighbor at column j-1 (left) or j+1 (right)
+            for w in range(words):
+                left[w] = row[w] << one
+                if w > 0:
+                    left[w] |= row[w - 1] >> top
+                right[w] = row[w] >> one
+                if w < words - 1:
+                    right[w] |= row[w + 1] << top
+            left[0] |= (row[words - 1] >> last_bit) & one
+            left[words - 1] &= last_mask
+            right[words - 1] |= (row[0] & one) << last_bit
+
+            color_mask = parity_masks[(color + i) % 2]
+            for w in range(words):
+                # Accept masks for Ediff = 4 (one disagreeing neighbor) and Ediff = 8 (none)
+                r4 = np.uint64(0)
+                r8 = np.uint64(0)
+                for b in range(min(64, n - 64 * w)):
+                    u = rand_u[color, i, 64 * w + b]
+                    if u < p4:
+                        r4 |= one << np.uint64(b)
+                    if u < p8:
+                        r8 |= one << np.uint64(b)
+
+                # Disagreement with each neighbor, summed with half adders
+                x1 = row[w] ^ up[w]
+                x2 = row[w] ^ down[w]
+                x3 = row[w] ^ left[w]
+                x4 = row[w] ^ right[w]
+                s12 = x1 ^ x2
+                c12 = x1 & x2
+                s34 = x3 ^ x4
+                c34 = x3 & x4
+                at_least_two = c12 | c34 | (s12 & s34)
+                exactly_one = (s12 ^ s34) & ~(c12 | c34)
+                none = ~(x1 | x2 | x3 | x4)
+
+                # Two or more disagreeing neighbors means Ediff <= 0: always flip
+                flip = color_mask & (at_least_two | (exactly_one & r4) | (none & r8))
+                if w == words - 1:
+                    flip &= last_mask
+                row[w] ^= flip
+
+    # Unpack into the int8 grid (the totals come for free while every site is visited anyway)
+    total = 0
+    for i in range(n):
+        for j in range(n):
+            spin = 1 - 2 * np.int8((bits[i, j >> 6] >> np.uint64(j & 63)) & one)
+            padded[i + 1, j + 1] = spin
+            total += spin
+    _refresh_halo(padded)
+    energy = 0
+    for i in range(1, n + 1):
+        for j in range(1, n + 1):
+            energy -= padded[i, j] * (padded[i + 1, j] + padded[i, j + 1])
+    return total, energy
+
+
+@njit(cache=True, parallel=True)
+def _sweep_replicas(grids, p_accept, rand_order_i, rand_order_j, rand_u):
+    """Sweep every replica with its own acceptance table in parallel, returns the change in total spin
+    and energy of each"""
+    delta_sums = np.zeros(grids.shape[0], dtype=np.int64)
+    delta_energies = np.zeros(grids.shape[0], dtype=np.int64)
+    for r in prange(grids.shape[0]):
+        delta_sums[r], delta_energies[r] = _sweep(grids[r], p_accept[r], rand_order_i, rand_order_j, rand_u[r])
+    return delta_sums, delta_energies
+
 
 class IsingModel:
-    def __init__(self, size=50, probability_spin_up=0.5):
+    def __init__(self, size=50, probability_spin_up=0.5, seed=None):
         # Size of the grid (NxN)
         self.size = size
         # Initial probability of a spin being +1
         self.probability_spin_up = probability_spin_up
-        self.grid = None
+        # Grid with a 1-cell halo mirroring the opposite edges (see the grid property)
+        self._padded = None
         # Sum of all spins in the grid (used for magnetization)
         self.sum_of_spins = 0
+        # Total energy of the grid, kept up to date by every update like sum_of_spins
+        self.energy = 0
         # Temperature of the system
         self.temperature = 2.0
         # Whether to use sequential update or shuffled updates
         self.sequential_update = False
+        # Random number generator (PCG64), draws whole blocks of numbers per sweep
+        self.rng = np.random.default_rng(seed)
+        # Whether to sweep the two checkerboard sublattices in vectorized form
+        # (only valid for even sizes, where the sublattices share no bonds)
+        self.checkerboard_update = False
+        # Whether the checkerboard sweep works on a bit-packed grid (64 sites per machine word)
+        self.bit_packed = False
+        # Whether to sweep with the plain-Python single-site update (slow, reference for the compiled kernels)
+        self.reference_update = False
 
     def setup(self):
         """Initialize the spin grid with random values (+1 or -1)"""
-        self.grid = np.zeros((self.size, self.size), dtype=int)
+        # One byte per spin keeps the whole grid in L1 cache
+        self._padded = np.empty((self.size + 2, self.size + 2), dtype=np.int8, order='C')
 
         # Generate a random matrix and assign spins based on probability
-        rand_matrix = np.random.random((self.size, self.size))
+        rand_matrix = self.rng.random((self.size, self.size))
         self.grid[rand_matrix < self.probability_spin_up] = 1
         self.grid[rand_matrix >= self.probability_spin_up] = -1
 
-        # Compute initial total spin
+        # Compute initial total spin and energy, afterwards both are only updated incrementally
         self.sum_of_spins = np.sum(self.grid)
+        self.energy = _grid_energy(self.grid)
+        self._inv_num_sites = 1.0 / (self.size * self.size)
+
+        # Checkerboard sublattices: neighbors always have opposite colors
+        parity = np.add.outer(np.arange(self.size), np.arange(self.size)) % 2
+        self.mask_black = parity == 0
+        self.mask_white = parity == 1
+
+    @property
+    def grid(self):
+        """Spin grid (NxN view on the interior of the padded grid)"""
+        if self._padded is None:
+            return None
+        return self._padded[1:-1, 1:-1]
+
+    @property
+    def temperature(self):
+        """Temperature of the system"""
+        return self._temperature
+
+    @temperature.setter
+    def temperature(self, value):
+        # Only 5 energy differences are possible, so the acceptance probabilities are tabulated once
+        self._temperature = value
+        self.p_accept = _acceptance_table(value)
 
     def get_neighbors_sum(self, i, j):
         """Calculate the sum of the four nearest neighbors (with periodic boundary conditions)"""
@@ -39,82 +315,258 @@ class IsingModel:
         )
         return neighbors_sum
 
-    def update_patch(self, i, j):
-        """Update a single spin using the Metropolis algorithm"""
-        current_spin = self.grid[i, j]
-        neighbors_sum = self.get_neighbors_sum(i, j)
+    def update_patch(self, i, j, u):
+        """Update a single spin using the Metropolis algorithm, with u uniform in [0, 1)"""
+        # Plain Python ints: NumPy scalar arithmetic is far slower for a single site
+        current_spin = int(self.grid[i, j])
+        neighbors_sum = int(self.get_neighbors_sum(i, j))
 
         # Compute energy difference if the spin is flipped
         Ediff = 2 * current_spin * neighbors_sum
 
-        # Metropolis criterion for spin flip
-        if (Ediff <= 0) or (self.temperature > 0 and 
-                            random.random() < np.exp(-Ediff / self.temperature)):
+        # Metropolis criterion for spin flip, with the tabulated acceptance instead of an exp per site
+        # (the table is 0 for Ediff > 0 at T = 0)
+        if (Ediff <= 0) or u < self.p_accept[Ediff // 4 + 2]:
             # Flip the spin
             self.grid[i, j] = -current_spin
-            # Update the total sum of spins accordingly
+            # Update the total sum of spins and the energy accordingly
             self.sum_of_spins += 2 * self.grid[i, j]
+            self.energy += Ediff
 
-    def go(self):
-        """Perform a full simulation step over the entire grid"""
-        # Generate list of all grid coordinates
-        coordinates = [(i, j) for i in range(self.size) for j in range(self.size)]
+    def update_sublattice(self, mask):
+        """Update all spins of one checkerboard color at once with the Metropolis algorithm"""
+        padded = self._padded
+        g = self.grid
 
-        # Shuffle the order unless sequential update is selected
-        if not self.sequential_update:
-            random.shuffle(coordinates)
+        # Sum of the four nearest neighbors for every site, read through the halo
+        # Widened to int16 so the energy arithmetic cannot overflow the int8 spins
+        _refresh_halo(padded)
+        neighbors_sum = (padded[:-2, 1:-1] + padded[2:, 1:-1] +
+                         padded[1:-1, :-2] + padded[1:-1, 2:]).astype(np.int16)
+        Ediff = 2 * g * neighbors_sum
 
-        # Update each spin
-        for i, j in coordinates:
-            self.update_patch(i, j)
+        # Metropolis criterion evaluated on the whole grid, applied only to the mask
+        p = self.p_accept[Ediff // 4 + 2]
+        flip = mask & (self.rng.random(g.shape, dtype=np.float32) < p)
+
+        # Totals only need the (small) subset of flipped sites
+        self.sum_of_spins -= 2 * np.sum(g[flip], dtype=np.int64)
+        self.energy += np.sum(Ediff[flip], dtype=np.int64)
+        g[flip] *= -1
+
+    def go(self):
+        """Perform a full simulation step over the entire grid"""
+        if self.reference_update:
+            # One site at a time in Python, in the same visit order as the compiled sweeps
+            if self.sequential_update:
+                order = range(self.size * self.size)
+            else:
+                order = self.rng.permutation(self.size * self.size).tolist()
+            rand_u = self.rng.random(self.size * self.size).tolist()
+            for site, u in zip(order, rand_u):
+                self.update_patch(site // self.size, site % self.size, u)
+            return
+
+        # Sites of the same color are independent, so each half can be updated in one shot
+        if self.checkerboard_update and self.size % 2 == 0:
+            if self.bit_packed:
+                rand_u = self.rng.random((2, self.size, self.size), dtype=np.float32)
+                self.sum_of_spins, self.energy = _sweep_bitpacked(self._padded, self.p_accept, rand_u)
+                return
+            self.update_sublattice(self.mask_black)
+            self.update_sublattice(self.mask_white)
+            return
+
+        # Single precision is plenty for the Metropolis threshold
+        rand_u = self.rng.random(self.size * self.size, dtype=np.float32)
+
+        # Update each spin in compiled code, tile by tile or in shuffled order
+        if self.sequential_update:
+            delta_sum, delta_energy = _sweep_tiled_for(self.size)(self._padded, self.p_accept, rand_u, TILE)
+        else:
+            order = self.rng.permutation(self.size * self.size)
+            delta_sum, delta_energy = _sweep(self._padded, self.p_accept,
+                                             order // self.size + 1, order % self.size + 1, rand_u)
+        self.sum_of_spins += delta_sum
+        self.energy += delta_energy
 
     def magnetization(self):
         """Calculate the average magnetization of the system"""
-        return self.sum_of_spins / (self.size * self.size)
+        return self.sum_of_spins * self._inv_num_sites
+
+    def run_temperature(self, temp, equilibration_steps=200, measurement_steps=200):
+        """Equilibrate at the given temperature, then return average magnetization, its fluctuations
+        and the specific heat per site (energy variance / T^2 / N^2)"""
+        self.temperature = temp
+
+        # Reset accumulators for this temperature
+        n = 0
+        summ = 0
+        summ2 = 0
+        sumE = 0
+        sumE2 = 0
+
+        # Simulate the system
+        for step in range(equilibration_steps + measurement_steps):
+            self.go()
+
+            # Start measuring after equilibration
+            if step >= equilibration_steps:
+                n += 1
+                m = self.magnetization()
+                summ += m
+                summ2 += m * m
+                E = int(self.energy)  # Exact integer sums, E^2 grows quickly with the size
+                sumE += E
+                sumE2 += E * E
+
+        # Compute average magnetization, its fluctuations and the specific heat
+        avg_magnetization = summ / n
+        fluctuation = (n * summ2 - summ * summ) / (n * (n - 1))
+        specific_heat = (n * sumE2 - sumE * sumE) / (n * (n - 1)) * self._inv_num_sites / (temp * temp)
+        return avg_magnetization, fluctuation, specific_heat
 
     def scan_temperature(self, T_start=3.0, T_end=2.0, T_step=0.01, 
-                         equilibration_steps=200, measurement_steps=200):
-        """Scan over a range of temperatures and collect magnetization data"""
+                         equilibration_steps=200, measurement_steps=200, workers=1):
+        """Scan over a range of temperatures and collect magnetization and specific heat data.
+
+        With workers=1 the same system is cooled step by step; with more workers the scan is split
+        into contiguous blocks of temperatures, each cooled step by step in its own process.
+        """
         temperatures = np.arange(T_start, T_end, -T_step)
         magnetizations = []
         fluctuations = []
+        specific_heats = []
 
         print(f"Scanning from T={T_start} to T={T_end} with {len(temperatures)} points...")
 
-        for temp_idx, temp in enumerate(temperatures):
-            self.temperature = temp
-
-            # Reset accumulators for this temperature
-            n = 0
-            summ = 0
-            summ2 = 0
-
-            # Simulate the system
-            for step in range(equilibration_steps + measurement_steps):
-                self.go()
-
-                # Start measuring after equilibration
-                if step >= equilibration_steps:
-                    n += 1
-                    m = self.magnetization()
-                    summ += m
-                    summ2 += m * m
-
-            # Compute average magnetization and its fluctuations
-            avg_magnetization = summ / n
-            fluctuation = (n * summ2 - summ * summ) / (n * (n - 1))
-
+        if workers > 1:
+            # One block per worker, with its own child seed so results do not depend on the scheduling
+            blocks = [block for block in np.array_split(temperatures, workers) if len(block)]
+            seeds = self.rng.bit_generator.seed_seq.spawn(len(blocks))
+            # Spawned workers: forking after numba has started its threading layer can hang
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                block_outputs = list(executor.map(_run_temperature_block, [self] * len(blocks), blocks,
+                                                  [equilibration_steps] * len(blocks),
+                                                  [measurement_steps] * len(blocks), seeds))
+            results = [result for block_results, _, _, _ in block_outputs for result in block_results]
+
+            # The workers simulated copies: keep the state of the coldest block as the current state of the model
+            _, self._padded, self.sum_of_spins, self.energy = block_outputs[-1]
+            self.temperature = temperatures[-1]
+        else:
+            results = (self.run_temperature(temp, equilibration_steps, measurement_steps)
+                       for temp in temperatures)
+
+        for temp_idx, (avg_magnetization, fluctuation, specific_heat) in enumerate(results):
             magnetizations.append(avg_magnetization)
             fluctuations.append(fluctuation)
+            specific_heats.append(specific_heat)
 
             # Print progress every 10 temperatures
             if temp_idx % 10 == 0:
-                print(f"Temperature: {temp:.2f}, Magnetization: {avg_magnetization:.3f}")
+                print(f"Temperature: {temperatures[temp_idx]:.2f}, Magnetization: {avg_magnetization:.3f}")
+
+        return temperatures, magnetizations, fluctuations, specific_heats
 
-        return temperatures, magnetizations, fluctuations
+    def replica_exchange_scan(self, T_start=3.0, T_end=2.0, T_step=0.01,
+                              equilibration_steps=200, measurement_steps=200,
+                              swap_interval=1, contract_near_Tc=True):
+        """Scan the temperatures with parallel tempering (one replica per temperature).
+
+        Neighboring replicas try to exchange temperatures every swap_interval sweeps, which
+        strongly reduces autocorrelation near the critical temperature.
+        """
+        temperatures = np.arange(T_start, T_end, -T_step)
+        if contract_near_Tc:
+            # Put more temperatures close to Tc, where the system decorrelates slowly; the map is monotonic
+            # and fixes Tc, so each side of Tc is stretched back onto its part of the requested range
+            def contract(T):
+                return T + 0.5 * (TC - T) / (0.6 + (TC - T) ** 2)
+            low, high = temperatures.min(), temperatures.max()
+            anchors = [low] + ([TC] if low < TC < high else []) + [high]
+            temperatures = np.interp(contract(temperatures), contract(np.array(anchors)), anchors)
+        num_replicas = len(temperatures)
+        betas = 1.0 / temperatures
+        num_sites = self.size * self.size
+
+        print(f"Replica exchange from T={T_start} to T={T_end} with {num_replicas} replicas...")
+
+        # Independent random initial grid for each replica, padded with a halo like the model grid;
+        # replicas below Tc start ordered, since a random grid gets stuck in domain states there
+        rand_matrix = self.rng.random((num_replicas, self.size, self.size))
+        padded_grids = np.zeros((num_replicas, self.size + 2, self.size + 2), dtype=np.int8)
+        grids = padded_grids[:, 1:-1, 1:-1]
+        grids[...] = np.where(rand_matrix < self.probability_spin_up, 1, -1)
+        grids[temperatures < TC] = 1
+        sums = grids.sum(axis=(1, 2))
+        energies = _grid_energy(grids)
+
+        # replica_at[t] is the replica currently simulated at temperatures[t]
+        replica_at = np.arange(num_replicas)
+        temperature_tables = _acceptance_table(temperatures)
+        replica_tables = temperature_tables.copy()
+
+        summ = np.zeros(num_replicas)
+        summ2 = np.zeros(num_replicas)
+        sumE = np.zeros(num_replicas)
+        sumE2 = np.zeros(num_replicas)
+        n = 0
+
+        for step in range(equilibration_steps + measurement_steps):
+            # One visit order per sweep, shared by all replicas
+            if self.sequential_update:
+                order = np.arange(num_sites)
+            else:
+                order = self.rng.permutation(num_sites)
+            rand_u = self.rng.random((num_replicas, num_sites), dtype=np.float32)
+            delta_sums, delta_energies = _sweep_replicas(padded_grids, replica_tables,
+                                                         order // self.size + 1, order % self.size + 1, rand_u)
+            sums += delta_sums
+            energies += delta_energies
+
+            if step % swap_interval == 0:
+                # Alternate between even and odd pairs of neighboring temperatures
+                for t in range((step // swap_interval) % 2, num_replicas - 1, 2):
+                    a, b = replica_at[t], replica_at[t + 1]
+                    delta = (betas[t] - betas[t + 1]) * (energies[a] - energies[b])
+                    if delta >= 0 or self.rng.random() < math.exp(delta):
+                        replica_at[t], replica_at[t + 1] = b, a
+                replica_tables[replica_at] = temperature_tables
+
+                # A replica arriving from above Tc can carry either sign: below Tc flip it whole
+                # (an exact symmetry, the energy does not change) so every temperature stays in the + phase
+                flipped = replica_at[(temperatures < TC) & (sums[replica_at] < 0)]
+                padded_grids[flipped] *= -1
+                sums[flipped] *= -1
+
+            # Start measuring after equilibration, the same observable as run_temperature
+            if step >= equilibration_steps:
+                n += 1
+                m = sums[replica_at] / num_sites
+                summ += m
+                summ2 += m * m
+                E = energies[replica_at].astype(np.float64)
+                sumE += E
+                sumE2 += E * E
+
+        # Compute average magnetization, its fluctuations and the specific heat at every temperature
+        magnetizations = summ / n
+        fluctuations = (n * summ2 - summ * summ) / (n * (n - 1))
+        specific_heats = (n * sumE2 - sumE * sumE) / (n * (n - 1)) / (num_sites * temperatures ** 2)
+
+        # Keep the last replica at the lowest temperature as the current state of the model
+        self._padded = padded_grids[replica_at[-1]].copy()
+        self.sum_of_spins = sums[replica_at[-1]]
+        self.energy = energies[replica_at[-1]]
+        self.temperature = temperatures[-1]
+
+        return temperatures, list(magnetizations), list(fluctuations), list(specific_heats)
 
     def visualize_grid(self):
         """Display the current state of the grid"""
+        import matplotlib.pyplot as plt  # Imported lazily: simulation-only runs and workers skip matplotlib
+
         plt.figure(figsize=(8, 8))
         # Color map: blue for +1, red for -1
         display_grid = np.where(self.grid == 1, 1, 0)
@@ -123,7 +575,24 @@ class IsingModel:
         plt.colorbar(label='Spin')
         plt.show()
 
+def _run_temperature_block(model, temperatures, equilibration_steps, measurement_steps, seed):
+    """Cool a fresh copy of the model through a block of temperatures (worker of the parallel scan).
+
+    A block starting below Tc starts from an ordered grid, like a system cooled from above would be:
+    a random grid gets stuck in domain states there.
+    Returns the results of each temperature, then the final padded grid, total spin and energy of the copy.
+    """
+    model.rng = np.random.default_rng(seed)
+    if temperatures[0] < TC:
+        model.probability_spin_up = 1.0
+    model.setup()
+    results = [model.run_temperature(temp, equilibration_steps, measurement_steps) for temp in temperatures]
+    return results, model._padded, model.sum_of_spins, model.energy
+
 def main():
+    # Parallel tempering (replica exchange) instead of the annealing scan
+    use_replica_exchange = False
+
     # Create and initialize the Ising model
     model = IsingModel(size=50, probability_spin_up=0.5)
     model.setup()
@@ -131,13 +600,22 @@ def main():
     print("Starting temperature scan...")
 
     # Run the temperature scan
-    temperatures, magnetizations, fluctuations = model.scan_temperature(
-        T_start=3.0, T_end=2.0, T_step=0.001,
-        equilibration_steps=200, measurement_steps=200
-    )
+    if use_replica_exchange:
+        temperatures, magnetizations, fluctuations, specific_heats = model.replica_exchange_scan(
+            T_start=3.0, T_end=2.0, T_step=0.001,
+            equilibration_steps=200, measurement_steps=200
+        )
+    else:
+        temperatures, magnetizations, fluctuations, specific_heats = model.scan_temperature(
+            T_start=3.0, T_end=2.0, T_step=0.001,
+            equilibration_steps=200, measurement_steps=200,
+            workers=os.cpu_count()
+        )
+
+    # Create plots for magnetization, fluctuations and specific heat
+    import matplotlib.pyplot as plt
 
-    # Create plots for magnetization and fluctuations
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(21, 6))
 
     # Plot magnetization vs temperature
     ax1.plot(temperatures, np.abs(magnetizations), 'b-', linewidth=2)
@@ -155,6 +633,14 @@ def main():
     ax2.grid(True, alpha=0.3)
     ax2.set_xlim(2.0, 3.0)
 
+    # Plot specific heat (energy variance per site) vs temperature
+    ax3.plot(temperatures, specific_heats, 'g-', linewidth=2)
+    ax3.set_xlabel('Temperature')
+    ax3.set_ylabel('Specific heat')
+    ax3.set_title('Specific Heat vs Temperature')
+    ax3.grid(True, alpha=0.3)
+    ax3.set_xlim(2.0, 3.0)
+
     plt.tight_layout()
     plt.show()
 
@@ -1,42 +1,58 @@
-import random
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Usa backend non-interattivo per evitare errori Qt/Wayland
-import matplotlib.pyplot as plt
 from timeit import default_timer as timer
 import os
 import subprocess
-import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+# Solutori CDCL in-process tramite python-sat (opzionale): senza, si usa l'eseguibile esterno di MiniSAT
+try:
+    from pysat.solvers import Solver as SolutorePySAT
+except ImportError:
+    SolutorePySAT = None
+
+# Backtracking compilato con Cython (opzionale, python setup.py build_ext --inplace): senza, la versione Numba
+# di solver_numba.py, e senza Numba la versione Python
+try:
+    from solver_core import solve as risolvi_csr_compilato
+except ImportError:
+    try:
+        from solver_numba import solve as risolvi_csr_compilato
+    except ImportError:
+        risolvi_csr_compilato = None
 
 os.makedirs('output', exist_ok=True)
 
+# Generatore casuale del modulo (per risultati riproducibili: generatore_casuale = np.random.default_rng(seme))
+generatore_casuale = np.random.default_rng()
 
-def genera_formula_3sat(num_variabili, num_clausole):
-    """Genera una formula 3-SAT casuale con il numero specificato di variabili e clausole."""
-    formula = []
+
+def genera_formula_3sat(num_variabili, num_clausole, generatore=None):
+    """Genera una formula 3-SAT casuale con il numero specificato di variabili e clausole.
     
-    for _ in range(num_clausole):
-        dimensione_clausola = 3  # 3-SAT come specificato nel paper
-        clausola = set()
-        letterali_usati = []
-        
-        while len(clausola) < dimensione_clausola:
-            # Seleziona una variabile casuale non ancora utilizzata in questa clausola
-            while True:
-                var_selezionata = random.randint(1, num_variabili)
-                if var_selezionata not in letterali_usati:
-                    letterali_usati.append(var_selezionata)
-                    break
-            
-            # Decide casualmente se negare la variabile
-            if random.choice([True, False]):
-                var_selezionata = -var_selezionata
-            
-            clausola.add(var_selezionata)
-        
-        formula.append(list(clausola))
+    Le estrazioni usano generatore (un numpy.random.Generator), o generatore_casuale se non è indicato.
+    """
+    dimensione_clausola = 3  # 3-SAT come specificato nel paper
+    if generatore is None:
+        generatore = generatore_casuale
+    
+    # Variabili distinte per ogni clausola senza rigetto: la k-esima è estratta fra le num_variabili - k
+    # rimaste e fatta scorrere oltre gli indici già usati (in ordine crescente)
+    variabili = np.empty((num_clausole, dimensione_clausola), dtype=np.int32)
+    for k in range(dimensione_clausola):
+        estratte = generatore.integers(0, num_variabili - k, size=num_clausole, dtype=np.int32)
+        for usata in np.sort(variabili[:, :k], axis=1).T:
+            estratte += estratte >= usata
+        variabili[:, k] = estratte
+    
+    # Decide casualmente se negare ciascuna variabile (un bit casuale per letterale)
+    segni = generatore.integers(0, 2, size=(num_clausole, dimensione_clausola), dtype=np.int32) * 2 - 1
+    formula = (variabili + 1) * segni
     
-    return formula
+    # Conversione in liste solo al confine con i solutori
+    return formula.tolist()
 
 
 def formula_to_dimacs(formula, num_variabili):
@@ -51,276 +67,771 @@ def formula_to_dimacs(formula, num_variabili):
     return "\n".join(dimacs_lines)
 
 
-def risolvi_con_minisat(formula, num_variabili, modalita_debug=False):
-    """Risolve una formula SAT usando MiniSAT esterno."""
+def scrivi_dimacs(formula, num_variabili, file):
+    """Scrive la formula CNF in formato DIMACS direttamente sul file, senza costruirne prima il testo completo."""
+    file.write(f"p cnf {num_variabili} {len(formula)}\n")
+    file.writelines(" ".join(map(str, clausola)) + " 0\n" for clausola in formula)
+
+
+def nome_cdcl(nome_solutore):
+    """Nome del solutore CDCL usato nei messaggi, nei titoli e nei nomi dei file dei grafici.
+    
+    Senza python-sat si usa sempre l'eseguibile di MiniSAT, qualunque sia nome_solutore.
+    """
+    if nome_solutore == 'minisat22' or SolutorePySAT is None:
+        return 'MiniSAT'
+    return nome_solutore
+
+
+def risolvi_con_minisat(formula, num_variabili, modalita_debug=False, nome_solutore='minisat22', solo_esito=False):
+    """Risolve una formula SAT usando MiniSAT, in-process se python-sat è installato.
+    
+    Con python-sat si può scegliere un altro solutore CDCL tramite nome_solutore
+    (ad es. 'glucose4' o 'cadical195', vedi pysat.solvers.SolverNames).
+    Con solo_esito restituisce True invece dell'assegnamento, senza estrarre il modello.
+    """
+    if SolutorePySAT is None:
+        return risolvi_con_minisat_esterno(formula, num_variabili, modalita_debug, solo_esito)
+    
+    # Nessun processo né file temporaneo: la lista di clausole è già il formato di python-sat
+    with SolutorePySAT(name=nome_solutore, bootstrap_with=formula) as solver:
+        soddisfacibile = solver.solve()
+        modello = solver.get_model() if soddisfacibile and not solo_esito else None
+    
+    if modalita_debug:
+        print(f"{nome_solutore} (python-sat): {'SAT' if soddisfacibile else 'UNSAT'}, modello: {modello}")
+    
+    if not soddisfacibile:
+        return None
+    if solo_esito:
+        return True
+    return {abs(lit): lit > 0 for lit in modello}
+
+
+def risolvi_con_minisat_esterno(formula, num_variabili, modalita_debug=False, solo_esito=False):
+    """Risolve una formula SAT usando MiniSAT esterno (con solo_esito restituisce True invece dell'assegnamento).
+    
+    Nessun file temporaneo: il DIMACS arriva a MiniSAT tramite pipe (/dev/stdin) e il risultato,
+    scritto su /dev/stdout, viene letto dall'output del processo.
+    """
+    if modalita_debug:
+        print(f"DIMACS content:\n{formula_to_dimacs(formula, num_variabili)}")
+    
     try:
-        # Crea file temporanei per input e output
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.cnf', delete=False) as input_file:
-            input_filename = input_file.name
-            dimacs_content = formula_to_dimacs(formula, num_variabili)
-            input_file.write(dimacs_content)
+        # Esegui MiniSAT
+        try:
+            processo = subprocess.Popen(['minisat', '-verb=0', '/dev/stdin', '/dev/stdout'], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except FileNotFoundError:
+            print("ERRORE: MiniSAT non trovato. Assicurati che sia installato e nel PATH.")
+            print("Su Ubuntu/Debian: sudo apt-get install minisat")
+            print("Su macOS: brew install minisat")
+            return None
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.out', delete=False) as output_file:
-            output_filename = output_file.name
+        # MiniSAT legge tutto l'input prima di scrivere, quindi si può scrivere il DIMACS e poi leggere l'output
+        # (communicate chiude lo stdin)
+        try:
+            scrivi_dimacs(formula, num_variabili, processo.stdin)
+            output_content, errori = processo.communicate(timeout=30)
+        except BrokenPipeError:
+            # MiniSAT è uscito prima di leggere tutta la formula (ad es. errore di parsing): non è un UNSAT
+            _, errori = processo.communicate()
+            print(f"ERRORE: MiniSAT è terminato prima di leggere la formula (codice {processo.returncode}): {errori}")
+            return None
+        except subprocess.TimeoutExpired:
+            if modalita_debug:
+                print("MiniSAT timeout")
+            return None
+        finally:
+            # In ogni caso il processo non sopravvive alla chiamata (kill non fa nulla se è già terminato)
+            processo.kill()
+            processo.wait()
         
         if modalita_debug:
-            print(f"DIMACS content:\n{dimacs_content}")
-            print(f"Input file: {input_filename}")
-            print(f"Output file: {output_filename}")
+            print(f"MiniSAT return code: {processo.returncode}")
+            print(f"MiniSAT stdout: {output_content}")
+            print(f"MiniSAT stderr: {errori}")
         
-        # Esegui MiniSAT
-        try:
-            result = subprocess.run([
-                'minisat', input_filename, output_filename
-            ], capture_output=True, text=True, timeout=30)
+        # Il risultato è una riga SAT o UNSAT (le statistiche stampano invece SATISFIABLE/UNSATISFIABLE),
+        # seguita con SAT dalla riga dell'assegnamento
+        lines = [line.strip() for line in output_content.splitlines()]
+        if "SAT" in lines:
+            if solo_esito:
+                return True
             
-            if modalita_debug:
-                print(f"MiniSAT return code: {result.returncode}")
-                print(f"MiniSAT stdout: {result.stdout}")
-                print(f"MiniSAT stderr: {result.stderr}")
-            
-            # Leggi il risultato
-            try:
-                with open(output_filename, 'r') as f:
-                    output_content = f.read().strip()
-                
-                if modalita_debug:
-                    print(f"MiniSAT output: {output_content}")
-                
-                lines = output_content.split('\n')
-                if not lines:
-                    return None
-                
-                # La prima riga contiene SAT o UNSAT
-                status_line = lines[0].strip()
-                
-                if status_line == "SAT":
-                    # Se c'è una seconda riga, contiene l'assegnamento
-                    if len(lines) > 1:
-                        assignment_line = lines[1].strip()
-                        literals = assignment_line.split()
-                        
-                        assignment = {}
-                        for lit in literals:
-                            if lit != '0':  # '0' è il terminatore
-                                var_num = abs(int(lit))
-                                assignment[var_num] = int(lit) > 0
-                        
-                        return assignment
-                    else:
-                        # SAT ma nessun assegnamento specifico fornito
-                        return {}
-                elif status_line == "UNSAT":
-                    return None
-                else:
-                    if modalita_debug:
-                        print(f"Unexpected MiniSAT status: {status_line}")
-                    return None
-                    
-            except FileNotFoundError:
-                if modalita_debug:
-                    print(f"Output file not found: {output_filename}")
-                return None
+            indice = lines.index("SAT")
+            if indice + 1 < len(lines):
+                assignment = {}
+                for lit in lines[indice + 1].split():
+                    if lit != '0':  # '0' è il terminatore
+                        var_num = abs(int(lit))
+                        assignment[var_num] = int(lit) > 0
                 
-        except subprocess.TimeoutExpired:
-            if modalita_debug:
-                print("MiniSAT timeout")
+                return assignment
+            else:
+                # SAT ma nessun assegnamento specifico fornito
+                return {}
+        elif "UNSAT" in lines:
             return None
-        except FileNotFoundError:
-            print("ERRORE: MiniSAT non trovato. Assicurati che sia installato e nel PATH.")
-            print("Su Ubuntu/Debian: sudo apt-get install minisat")
-            print("Su macOS: brew install minisat")
+        else:
+            # Né SAT né UNSAT: MiniSAT non ha risolto la formula (ad es. errore di parsing), non è un UNSAT
+            print(f"ERRORE: risultato inatteso da MiniSAT (codice {processo.returncode}): {output_content}{errori}")
             return None
         
     except Exception as e:
         if modalita_debug:
             print(f"Errore durante l'esecuzione di MiniSAT: {e}")
         return None
-    finally:
-        # Pulizia file temporanei
-        try:
-            os.unlink(input_filename)
-            os.unlink(output_filename)
-        except:
-            pass
 
 
-def semplifica_formula_booleana(formula_cnf, variabile_assegnata, valore_verita):
-    """Semplifica la formula CNF dato un assegnamento di una variabile."""
-    formula_risultante = []
-    
-    for clausola_corrente in formula_cnf:
-        if valore_verita:  # variabile_assegnata = True
-            if variabile_assegnata in clausola_corrente:
-                continue  # Clausola soddisfatta, rimuovila
-            nuova_clausola = [lit for lit in clausola_corrente if lit != -variabile_assegnata]
-        else:  # variabile_assegnata = False
-            if -variabile_assegnata in clausola_corrente:
-                continue  # Clausola soddisfatta, rimuovila
-            nuova_clausola = [lit for lit in clausola_corrente if lit != variabile_assegnata]
-        
-        if not nuova_clausola and nuova_clausola != clausola_corrente:
-            return None  # Clausola vuota dopo semplificazione -> insoddisfacibile
-        
-        formula_risultante.append(nuova_clausola)
+def formula_to_csr(formula):
+    """Converte una formula CNF (lista di clausole) nel formato CSR: letterali concatenati e inizio di ogni clausola."""
+    lunghezze = np.fromiter((len(clausola) for clausola in formula), dtype=np.int32, count=len(formula))
+    inizi = np.zeros(len(formula) + 1, dtype=np.int32)
+    np.cumsum(lunghezze, out=inizi[1:])
+    letterali = np.fromiter((lit for clausola in formula for lit in clausola), dtype=np.int32, count=inizi[-1])
+    return letterali, inizi
+
+
+def ordine_decisioni(formula_cnf, num_variabili, usa_euristiche):
+    """Ordine in cui i solutori scelgono le variabili di decisione (formula in formato CSR).
     
-    return formula_risultante
+    Senza euristiche è l'ordine di indice; con le euristiche è l'ordine statico di Jeroslow-Wang:
+    punteggio di v = somma di 2^-|clausola| sulle clausole che contengono v o -v, decrescente
+    (a parità di punteggio vince l'indice più basso).
+    """
+    letterali, inizi = formula_cnf
+    if not usa_euristiche:
+        return np.arange(1, num_variabili + 1, dtype=np.int32)
+    lunghezze = np.diff(inizi)
+    pesi = np.repeat(0.5 ** lunghezze, lunghezze)
+    punteggio = np.bincount(np.abs(letterali), weights=pesi, minlength=num_variabili + 1)[1:]
+    return (np.argsort(-punteggio, kind='stable') + 1).astype(np.int32)
 
 
-def risolvi_con_backtracking(formula_cnf, lista_variabili, assegnamento_corrente, usa_euristiche, modalita_debug):
-    """Risolve usando l'algoritmo di backtracking con opzionale propagazione unitaria."""
-    if modalita_debug:
-        print(f"Backtracking: formula={formula_cnf}, variabili={lista_variabili}, assegnamento={assegnamento_corrente}")
+def risolvi_con_backtracking(formula_cnf, num_variabili, usa_euristiche, modalita_debug, solo_esito=False):
+    """Risolve usando l'algoritmo di backtracking con opzionale propagazione unitaria ed eliminazione dei letterali
+    puri (solo alla radice, come nelle versioni compilate).
+    
+    La formula è in formato CSR (vedi formula_to_csr) e viene modificata sul posto: ogni assegnamento
+    marca le clausole soddisfatte e i letterali falsi rimossi, registrandoli su un trail che al
+    backtracking viene ripercorso all'indietro per ripristinare lo stato.
+    La propagazione unitaria usa una coda di clausole diventate unitarie e prosegue fino al punto fisso.
+    La ricerca è iterativa, con uno stack esplicito delle decisioni al posto della ricorsione;
+    le variabili di decisione seguono ordine_decisioni. Con solo_esito restituisce True invece dell'assegnamento.
+    """
+    letterali, inizi = formula_cnf
+    
+    # Versione compilata se disponibile (le stampe di debug esistono solo nella versione Python)
+    if risolvi_csr_compilato is not None and not modalita_debug:
+        assegnamento = risolvi_csr_compilato(letterali, inizi, num_variabili, usa_euristiche)
+        if assegnamento is None:
+            return None
+        if solo_esito:
+            return True
+        return {v: bool(assegnamento[v] > 0) for v in range(1, num_variabili + 1) if assegnamento[v] != 0}
     
-    # Caso base: formula vuota -> soddisfacibile
-    if not formula_cnf:
-        return assegnamento_corrente
+    # Versione Python: liste e interi semplici, ogni assegnamento tocca pochi elementi e le operazioni
+    # NumPy su array così piccoli costano più del lavoro che fanno
+    num_clausole = len(inizi) - 1
+    lista_letterali = letterali.tolist()
+    lista_inizi = inizi.tolist()
+    clausola_di = [c for c in range(num_clausole) for _ in range(lista_inizi[c], lista_inizi[c + 1])]
     
     # Caso base: clausola vuota presente -> insoddisfacibile
-    if any(not clausola for clausola in formula_cnf):
+    if any(lista_inizi[c] == lista_inizi[c + 1] for c in range(num_clausole)):
         return None
     
-    # APPLICAZIONE EURISTICHE
+    # Posizioni nel vettore delle occorrenze di ogni letterale (indice lit + num_variabili)
+    posizioni_di = [[] for _ in range(2 * num_variabili + 1)]
+    for posizione, letterale in enumerate(lista_letterali):
+        posizioni_di[letterale + num_variabili].append(posizione)
+    
+    # Stato della formula semplificata
+    clausola_soddisfatta = [False] * num_clausole
+    letterale_vivo = [True] * len(lista_letterali)
+    letterali_vivi = [lista_inizi[c + 1] - lista_inizi[c] for c in range(num_clausole)]  # Letterali rimasti
+    # Somma dei letterali rimasti: quando ne resta uno solo è il letterale stesso
+    somma_vivi = [sum(lista_letterali[lista_inizi[c]:lista_inizi[c + 1]]) for c in range(num_clausole)]
+    coda_unitarie = deque()  # Clausole diventate unitarie, ancora da propagare
+    assegnamento = [0] * (num_variabili + 1)  # 1 vero, -1 falso, 0 non assegnato
+    num_soddisfatte = 0
+    trail = []  # Eventi (tipo, indice) da annullare al backtracking
+    
+    def assegna(letterale):
+        """Rende vero il letterale; restituisce True se una clausola resta vuota."""
+        nonlocal num_soddisfatte
+        variabile = abs(letterale)
+        assegnamento[variabile] = 1 if letterale > 0 else -1
+        trail.append(('variabile', variabile))
+        
+        # Clausole soddisfatte dal letterale vero
+        for posizione in posizioni_di[letterale + num_variabili]:
+            clausola = clausola_di[posizione]
+            if not clausola_soddisfatta[clausola]:
+                clausola_soddisfatta[clausola] = True
+                num_soddisfatte += 1
+                trail.append(('clausola', clausola))
+        
+        # Letterali falsi rimossi dalle clausole non soddisfatte
+        for posizione in posizioni_di[-letterale + num_variabili]:
+            clausola = clausola_di[posizione]
+            if letterale_vivo[posizione] and not clausola_soddisfatta[clausola]:
+                letterale_vivo[posizione] = False
+                letterali_vivi[clausola] -= 1
+                somma_vivi[clausola] += letterale  # Toglie -letterale
+                trail.append(('letterale', posizione))
+                if letterali_vivi[clausola] == 0:
+                    return True
+                if letterali_vivi[clausola] == 1 and usa_euristiche:
+                    coda_unitarie.append(clausola)
+        return False
+    
+    def annulla(lunghezza_trail):
+        """Ripristina lo stato ripercorrendo il trail all'indietro."""
+        nonlocal num_soddisfatte
+        while len(trail) > lunghezza_trail:
+            tipo, indice = trail.pop()
+            if tipo == 'variabile':
+                assegnamento[indice] = 0
+            elif tipo == 'clausola':
+                clausola_soddisfatta[indice] = False
+                num_soddisfatte -= 1
+            else:
+                letterale_vivo[indice] = True
+                letterali_vivi[clausola_di[indice]] += 1
+                somma_vivi[clausola_di[indice]] += lista_letterali[indice]
+        coda_unitarie.clear()  # Le clausole in coda si riferivano allo stato annullato
+    
     if usa_euristiche:
-        # Propagazione Unitaria: trova clausole con un solo letterale
-        clausole_unitarie = [clausola[0] for clausola in formula_cnf if len(clausola) == 1]
+        # Letterali puri, solo alla radice come nelle versioni compilate: compaiono nelle clausole non
+        # soddisfatte con una sola polarità, renderli veri soddisfa le loro clausole senza crearne di
+        # unitarie; ripete finché ne compaiono di nuovi
+        while True:
+            occorrenze = [0] * (2 * num_variabili + 1)
+            for posizione, letterale in enumerate(lista_letterali):
+                if not clausola_soddisfatta[clausola_di[posizione]]:
+                    occorrenze[letterale + num_variabili] += 1
+            puri = [v if occorrenze[num_variabili + v] else -v for v in range(1, num_variabili + 1)
+                    if assegnamento[v] == 0 and (occorrenze[num_variabili + v] > 0) != (occorrenze[num_variabili - v] > 0)]
+            if not puri:
+                break
+            for letterale_puro in puri:
+                if modalita_debug:
+                    print(f"Letterale puro: {letterale_puro}")
+                assegna(letterale_puro)
         
-        for letterale_unitario in clausole_unitarie:
+        coda_unitarie.extend(c for c in range(num_clausole) if letterali_vivi[c] == 1)
+    
+    # Ricerca iterativa: decisioni aperte (lunghezza del trail prima della decisione, posizione in
+    # ordine_variabili, False già provato)
+    ordine_variabili = ordine_decisioni(formula_cnf, num_variabili, usa_euristiche).tolist()
+    decisioni = []
+    prossima_posizione = 0
+    conflitto = False
+    
+    while True:
+        if conflitto:
+            # Backtracking: annulla fino all'ultima decisione con False ancora da provare
+            while decisioni:
+                inizio_tentativo, posizione, provato_false = decisioni.pop()
+                annulla(inizio_tentativo)
+                if not provato_false:
+                    break
+            else:
+                return None  # Insoddisfacibile
+            
+            variabile = ordine_variabili[posizione]
             if modalita_debug:
-                print(f"Propagazione unitaria con clausola: {letterale_unitario}")
+                print(f"Provo variabile {variabile} = False")
             
-            if letterale_unitario > 0:
-                formula_cnf = semplifica_formula_booleana(formula_cnf, letterale_unitario, True)
-                assegnamento_corrente[letterale_unitario] = True
-            else:
-                formula_cnf = semplifica_formula_booleana(formula_cnf, -letterale_unitario, False)
-                assegnamento_corrente[-letterale_unitario] = False
+            decisioni.append((inizio_tentativo, posizione, True))
+            prossima_posizione = posizione + 1
+            conflitto = assegna(-variabile)
+            continue
+        
+        if modalita_debug:
+            formula_corrente = [[lista_letterali[p] for p in range(lista_inizi[k], lista_inizi[k + 1]) if letterale_vivo[p]]
+                                for k in range(num_clausole) if not clausola_soddisfatta[k]]
+            print(f"Backtracking: formula={formula_corrente}, assegnamento={assegnamento[1:]}")
+        
+        # APPLICAZIONE EURISTICHE
+        if usa_euristiche:
+            # Propagazione Unitaria: le clausole diventate unitarie sono in coda, e ogni letterale
+            # propagato può accodarne altre, fino al punto fisso
+            while coda_unitarie and not conflitto:
+                clausola = coda_unitarie.popleft()
+                if clausola_soddisfatta[clausola] or letterali_vivi[clausola] != 1:
+                    continue  # Già soddisfatta da un letterale propagato prima
+                letterale_unitario = somma_vivi[clausola]
+                
+                if modalita_debug:
+                    print(f"Propagazione unitaria con clausola: {letterale_unitario}")
+                
+                conflitto = assegna(letterale_unitario)
             
-            if formula_cnf is None:
-                return None  # Conflitto durante propagazione unitaria
+            if conflitto:
+                continue  # Conflitto durante propagazione unitaria
+        
+        # Caso base: tutte le clausole soddisfatte -> soddisfacibile
+        if num_soddisfatte == num_clausole:
+            break
+        
+        # ALGORITMO SAT CLASSICO
+        while prossima_posizione < num_variabili and assegnamento[ordine_variabili[prossima_posizione]] != 0:
+            prossima_posizione += 1
+        if prossima_posizione == num_variabili:
+            conflitto = True
+            continue
+        
+        variabile = ordine_variabili[prossima_posizione]
+        if modalita_debug:
+            print(f"Provo variabile {variabile} = True")
+        
+        decisioni.append((len(trail), prossima_posizione, False))
+        conflitto = assegna(variabile)
+        prossima_posizione += 1
+    
+    if solo_esito:
+        return True
+    return {v: bool(assegnamento[v] > 0) for v in range(1, num_variabili + 1) if assegnamento[v] != 0}
+
+
+def risolvi_con_bitset(formula_cnf, num_variabili, usa_euristiche, modalita_debug):
+    """Backtracking con le clausole rappresentate come maschere di bit (per meno di 64 variabili).
+    
+    Ogni clausola è una coppia di uint64: bit v di positivi se contiene +v, di negativi se contiene -v.
+    Assegnare una variabile costa poche operazioni bit a bit vettoriali su tutte le clausole, senza
+    scorrere i letterali. Stesse euristiche degli altri motori (letterali puri solo alla radice,
+    propagazione unitaria a ogni nodo, ordine di ordine_decisioni); la formula è in formato CSR.
+    """
+    if num_variabili >= 64:
+        raise ValueError(f"risolvi_con_bitset gestisce al più 63 variabili, non {num_variabili}")
+    
+    letterali, inizi = formula_cnf
+    lunghezze = np.diff(inizi)
+    
+    # Casi base: formula vuota -> soddisfacibile, clausola vuota -> insoddisfacibile
+    if len(lunghezze) == 0:
+        return {}
+    if np.any(lunghezze == 0):
+        return None
+    
+    bit = np.left_shift(np.uint64(1), np.abs(letterali).astype(np.uint64))
+    positivi = np.bitwise_or.reduceat(np.where(letterali > 0, bit, np.uint64(0)), inizi[:-1])
+    negativi = np.bitwise_or.reduceat(np.where(letterali < 0, bit, np.uint64(0)), inizi[:-1])
+    assegnamento = {}
+    ordine_variabili = ordine_decisioni(formula_cnf, num_variabili, usa_euristiche).tolist()
+    
+    def assegna(positivi, negativi, letterale):
+        """Rimuove le clausole soddisfatte e il letterale falso; None se una clausola resta vuota."""
+        maschera = np.uint64(1 << abs(letterale))
+        if letterale > 0:
+            rimaste = (positivi & maschera) == 0
+            positivi, negativi = positivi[rimaste], negativi[rimaste] & ~maschera
+        else:
+            rimaste = (negativi & maschera) == 0
+            positivi, negativi = positivi[rimaste] & ~maschera, negativi[rimaste]
+        if np.any((positivi | negativi) == 0):
+            return None
+        return positivi, negativi
+    
+    def ricerca(positivi, negativi, prossima_posizione):
+        if modalita_debug:
+            formula_corrente = [[v for v in range(1, num_variabili + 1) if p >> v & 1] +
+                                [-v for v in range(1, num_variabili + 1) if q >> v & 1]
+                                for p, q in zip(positivi.tolist(), negativi.tolist())]
+            print(f"Backtracking (bitset): formula={formula_corrente}, assegnamento={assegnamento}")
+        
+        # Caso base: nessuna clausola rimasta -> soddisfacibile
+        if len(positivi) == 0:
+            return True
+        
+        assegnate_nel_nodo = []
+        
+        # APPLICAZIONE EURISTICHE
+        if usa_euristiche:
+            # Propagazione Unitaria fino al punto fisso: un solo bit acceso (m & (m - 1) == 0) e non tautologica
+            while True:
+                tutti = positivi | negativi
+                unitarie = np.flatnonzero(((tutti & (tutti - np.uint64(1))) == 0) & ((positivi & negativi) == 0))
+                if len(unitarie) == 0:
+                    break
+                clausole_unitarie = [p.bit_length() - 1 if p else -(q.bit_length() - 1)
+                                     for p, q in zip(positivi[unitarie].tolist(), negativi[unitarie].tolist())]
+                
+                for letterale_unitario in clausole_unitarie:
+                    if abs(letterale_unitario) in assegnamento:
+                        continue  # Già assegnato da una clausola unitaria precedente
+                    
+                    if modalita_debug:
+                        print(f"Propagazione unitaria con clausola: {letterale_unitario}")
+                    
+                    risultato = assegna(positivi, negativi, letterale_unitario)
+                    if risultato is None:
+                        for variabile in assegnate_nel_nodo:
+                            del assegnamento[variabile]
+                        return False  # Conflitto durante propagazione unitaria
+                    positivi, negativi = risultato
+                    assegnamento[abs(letterale_unitario)] = letterale_unitario > 0
+                    assegnate_nel_nodo.append(abs(letterale_unitario))
             
-            if abs(letterale_unitario) in lista_variabili:
-                lista_variabili.remove(abs(letterale_unitario))
+            if len(positivi) == 0:
+                return True
+        
+        # ALGORITMO SAT CLASSICO
+        while prossima_posizione < num_variabili and ordine_variabili[prossima_posizione] in assegnamento:
+            prossima_posizione += 1
+        
+        if prossima_posizione < num_variabili:
+            variabile = ordine_variabili[prossima_posizione]
+            for valore in (True, False):
+                if modalita_debug:
+                    print(f"Provo variabile {variabile} = {valore}")
+                
+                risultato = assegna(positivi, negativi, variabile if valore else -variabile)
+                if risultato is not None:
+                    assegnamento[variabile] = valore
+                    if ricerca(*risultato, prossima_posizione + 1):
+                        return True
+                    del assegnamento[variabile]
         
-        if not lista_variabili:
-            return assegnamento_corrente
+        for variabile in assegnate_nel_nodo:
+            del assegnamento[variabile]
+        return False  # Insoddisfacibile
     
-    # ALGORITMO SAT CLASSICO
-    variabile_da_provare = lista_variabili[0]
-    variabili_rimanenti = lista_variabili[1:]
+    if usa_euristiche:
+        # Letterali puri, solo alla radice come negli altri motori: bit presenti con una sola polarità nelle
+        # clausole rimaste; renderli veri rimuove le loro clausole in un colpo solo, e può rendere puri altri letterali
+        while len(positivi):
+            tutti_positivi = int(np.bitwise_or.reduce(positivi))
+            tutti_negativi = int(np.bitwise_or.reduce(negativi))
+            puri_positivi = tutti_positivi & ~tutti_negativi
+            puri_negativi = tutti_negativi & ~tutti_positivi
+            if not (puri_positivi or puri_negativi):
+                break
+            
+            for variabile in range(1, num_variabili + 1):
+                if (puri_positivi | puri_negativi) >> variabile & 1:
+                    if modalita_debug:
+                        print(f"Letterale puro: {variabile if puri_positivi >> variabile & 1 else -variabile}")
+                    assegnamento[variabile] = bool(puri_positivi >> variabile & 1)
+            
+            rimaste = ((positivi & np.uint64(puri_positivi)) == 0) & ((negativi & np.uint64(puri_negativi)) == 0)
+            positivi, negativi = positivi[rimaste], negativi[rimaste]
     
-    # Prova ad assegnare True alla variabile
-    nuovo_assegnamento = assegnamento_corrente.copy()
-    nuovo_assegnamento[variabile_da_provare] = True
-    formula_semplificata = semplifica_formula_booleana(formula_cnf, variabile_da_provare, True)
+    return assegnamento if ricerca(positivi, negativi, 0) else None
+
+
+def risolvi_con_watched_literals(formula, num_variabili, usa_euristiche, modalita_debug):
+    """Risolve con DPLL iterativo basato su due letterali osservati (two-watched literals) e trail.
     
-    if modalita_debug:
-        print(f"Provo variabile {variabile_da_provare} = True, formula semplificata: {formula_semplificata}")
+    Ogni clausola osserva due suoi letterali e viene esaminata solo quando uno dei due diventa falso,
+    quindi un assegnamento tocca solo le clausole che lo osservano; il backtracking annulla il trail
+    invece di copiare formula e assegnamento. Con le euristiche si applicano propagazione unitaria,
+    alla radice eliminazione dei letterali puri, e le decisioni seguono l'ordine di Jeroslow-Wang.
+    """
+    # Stato dei letterali indicizzato da lit + num_variabili: 1 vero, -1 falso, 0 non assegnato
+    stato = [0] * (2 * num_variabili + 1)
+    trail = []  # Letterali resi veri, in ordine di assegnamento
     
-    if formula_semplificata is not None:
-        risultato = risolvi_con_backtracking(formula_semplificata, variabili_rimanenti, nuovo_assegnamento, 
-                                           usa_euristiche, modalita_debug)
-        if risultato is not None:
-            return risultato
+    def assegna(letterale):
+        stato[letterale + num_variabili] = 1
+        stato[-letterale + num_variabili] = -1
+        trail.append(letterale)
     
-    # Prova ad assegnare False alla variabile
-    nuovo_assegnamento[variabile_da_provare] = False
-    formula_semplificata = semplifica_formula_booleana(formula_cnf, variabile_da_provare, False)
+    # Clausole senza letterali ripetuti; le tautologie sono sempre soddisfatte e vengono scartate
+    clausole = []
+    for clausola in formula:
+        clausola = list(dict.fromkeys(clausola))
+        if any(-lit in clausola for lit in clausola):
+            continue
+        if not clausola:
+            return None  # Clausola vuota -> insoddisfacibile
+        clausole.append(clausola)
     
-    if modalita_debug:
-        print(f"Provo variabile {variabile_da_provare} = False, formula semplificata: {formula_semplificata}")
+    # I primi due letterali di ogni clausola sono quelli osservati
+    osservatori = {lit: [] for v in range(1, num_variabili + 1) for lit in (v, -v)}
+    for indice, clausola in enumerate(clausole):
+        for lit in clausola[:2]:
+            osservatori[lit].append(indice)
+    
+    if usa_euristiche:
+        # Letterali puri, solo alla radice come negli altri solutori: compaiono con una sola polarità nelle
+        # clausole non soddisfatte, assegnarli soddisfa tutte le loro clausole; ripete fino al punto fisso
+        nuovi_puri = True
+        while nuovi_puri:
+            occorrenze = [0] * (2 * num_variabili + 1)
+            for clausola in clausole:
+                if not any(stato[lit + num_variabili] == 1 for lit in clausola):
+                    for lit in clausola:
+                        occorrenze[lit + num_variabili] += 1
+            nuovi_puri = False
+            for v in range(1, num_variabili + 1):
+                if stato[v + num_variabili] != 0:
+                    continue
+                if occorrenze[v + num_variabili] == 0 and occorrenze[-v + num_variabili] > 0:
+                    assegna(-v)
+                    nuovi_puri = True
+                elif occorrenze[-v + num_variabili] == 0 and occorrenze[v + num_variabili] > 0:
+                    assegna(v)
+                    nuovi_puri = True
+        
+        # Clausole unitarie iniziali
+        for clausola in clausole:
+            if len(clausola) == 1:
+                if stato[clausola[0] + num_variabili] == -1:
+                    return None
+                if stato[clausola[0] + num_variabili] == 0:
+                    assegna(clausola[0])
+    
+    def propaga(inizio):
+        """Processa i letterali del trail da inizio in poi; restituisce True in caso di conflitto."""
+        while inizio < len(trail):
+            falso = -trail[inizio]
+            inizio += 1
+            lista = osservatori[falso]
+            i = j = 0
+            while i < len(lista):
+                indice = lista[i]
+                clausola = clausole[indice]
+                i += 1
+                
+                if len(clausola) == 1:
+                    # Unico letterale falso -> conflitto
+                    lista[j:] = lista[i - 1:]
+                    return True
+                
+                # Il letterale diventato falso va in seconda posizione
+                if clausola[0] == falso:
+                    clausola[0], clausola[1] = clausola[1], clausola[0]
+                altro = clausola[0]
+                
+                if stato[altro + num_variabili] == 1:
+                    lista[j] = indice  # Clausola già soddisfatta, continua a osservare
+                    j += 1
+                    continue
+                
+                # Cerca un nuovo letterale non falso da osservare
+                for k in range(2, len(clausola)):
+                    if stato[clausola[k] + num_variabili] != -1:
+                        clausola[1], clausola[k] = clausola[k], clausola[1]
+                        osservatori[clausola[1]].append(indice)
+                        break
+                else:
+                    lista[j] = indice
+                    j += 1
+                    if stato[altro + num_variabili] == -1:
+                        lista[j:] = lista[i:]  # Tutti i letterali falsi -> conflitto
+                        return True
+                    if usa_euristiche:
+                        assegna(altro)  # Clausola unitaria -> propagazione
+            del lista[j:]
+        return False
     
-    if formula_semplificata is not None:
-        risultato = risolvi_con_backtracking(formula_semplificata, variabili_rimanenti, nuovo_assegnamento, 
-                                           usa_euristiche, modalita_debug)
-        if risultato is not None:
-            return risultato
+    # Decisioni: (lunghezza del trail prima della decisione, posizione in ordine_variabili, False già provato)
+    ordine_variabili = ordine_decisioni(formula_to_csr(formula), num_variabili, usa_euristiche).tolist()
+    decisioni = []
+    conflitto = propaga(0)
+    prossima_posizione = 0
     
-    return None  # Insoddisfacibile
+    while True:
+        if conflitto:
+            if modalita_debug:
+                print(f"Conflitto, trail={trail}")
+            
+            # Backtracking: annulla il trail fino all'ultima decisione con False ancora da provare
+            while decisioni:
+                posizione, posizione_ordine, provato_false = decisioni.pop()
+                for lit in trail[posizione:]:
+                    stato[lit + num_variabili] = 0
+                    stato[-lit + num_variabili] = 0
+                del trail[posizione:]
+                prossima_posizione = min(prossima_posizione, posizione_ordine)
+                if not provato_false:
+                    decisioni.append((posizione, posizione_ordine, True))
+                    assegna(-ordine_variabili[posizione_ordine])
+                    break
+            else:
+                return None  # Insoddisfacibile
+            
+            conflitto = propaga(posizione)
+            continue
+        
+        # Prossima variabile non assegnata, secondo ordine_decisioni
+        while prossima_posizione < num_variabili and stato[ordine_variabili[prossima_posizione] + num_variabili] != 0:
+            prossima_posizione += 1
+        if prossima_posizione == num_variabili:
+            return {abs(lit): lit > 0 for lit in trail}
+        
+        variabile = ordine_variabili[prossima_posizione]
+        if modalita_debug:
+            print(f"Provo variabile {variabile} = True, trail={trail}")
+        
+        decisioni.append((len(trail), prossima_posizione, False))
+        assegna(variabile)
+        conflitto = propaga(len(trail) - 1)
 
 
-def verifica_soddisfacibilita(clausole_formula, numero_variabili, applica_euristiche, debug_attivo, usa_minisat=False):
-    """Verifica se una formula 3-SAT è soddisfacibile."""
+def verifica_soddisfacibilita(clausole_formula, numero_variabili, applica_euristiche, debug_attivo, usa_minisat=False,
+                              usa_watched_literals=False, nome_solutore='minisat22', solo_esito=False, usa_bitset=False):
+    """Verifica se una formula 3-SAT è soddisfacibile.
+    
+    Restituisce l'assegnamento, o None se insoddisfacibile; con solo_esito i solutori che altrimenti
+    dovrebbero ricostruire l'assegnamento restituiscono solo True.
+    Con usa_minisat, nome_solutore sceglie il solutore CDCL di python-sat (vedi risolvi_con_minisat);
+    usa_bitset sceglie il backtracking su maschere di bit (meno di 64 variabili).
+    """
     if usa_minisat:
-        return risolvi_con_minisat(clausole_formula, numero_variabili, debug_attivo)
+        return risolvi_con_minisat(clausole_formula, numero_variabili, debug_attivo, nome_solutore, solo_esito)
+    elif usa_watched_literals:
+        return risolvi_con_watched_literals(clausole_formula, numero_variabili, applica_euristiche, debug_attivo)
+    elif usa_bitset:
+        return risolvi_con_bitset(formula_to_csr(clausole_formula), numero_variabili, applica_euristiche, debug_attivo)
     else:
-        variabili_disponibili = list(range(1, numero_variabili + 1))
-        assegnamento_iniziale = {}
-        return risolvi_con_backtracking(clausole_formula, variabili_disponibili, assegnamento_iniziale, 
-                                      applica_euristiche, debug_attivo)
+        return risolvi_con_backtracking(formula_to_csr(clausole_formula), numero_variabili, applica_euristiche,
+                                        debug_attivo, solo_esito)
+
+
+def _esegui_esperimento(num_var, m_clausole, euristiche_attive, usa_minisat, usa_watched_literals, nome_solutore,
+                        usa_bitset, seme=None):
+    """Genera e risolve una formula casuale; restituisce (tempo di risoluzione, soddisfacibile).
+    
+    Con un seme la formula è estratta da un generatore proprio, così il risultato non dipende dal processo che lo esegue.
+    """
+    generatore = np.random.default_rng(seme) if seme is not None else None
+    formula_test = genera_formula_3sat(num_var, m_clausole, generatore)
+    
+    inizio_tempo = timer()
+    # Serve solo l'esito SAT/UNSAT, non l'assegnamento
+    risultato_sat = verifica_soddisfacibilita(formula_test, num_var, euristiche_attive, False, usa_minisat,
+                                             usa_watched_literals, nome_solutore, solo_esito=True, usa_bitset=usa_bitset)
+    fine_tempo = timer()
+    
+    return fine_tempo - inizio_tempo, risultato_sat is not None
 
 
-def test_probabilita_soddisfacibilita(num_var, lista_num_clausole, num_esperimenti, euristiche_attive, usa_minisat=False):
-    """Testa la probabilità di soddisfacibilità per diversi rapporti clausole/variabili."""
+def _esegui_esperimenti(executor, workers, num_var, lista_num_clausole, num_esperimenti, euristiche_attive, usa_minisat,
+                        usa_watched_literals, nome_solutore, usa_bitset):
+    """Esegue num_esperimenti prove indipendenti per ogni numero di clausole, in serie (executor None) o
+    distribuite sui processi; restituisce i risultati (tempo, soddisfacibile) in ordine di clausole e prova.
+    
+    Le prove di tutti i rapporti sono inviate insieme, così i processi non restano fermi alla fine di ogni rapporto.
+    """
+    clausole_per_prova = [int(m_clausole) for m_clausole in lista_num_clausole for _ in range(num_esperimenti)]
+    
+    # Un seme per prova, estratto da generatore_casuale prima di qualsiasi prova: le formule dipendono solo
+    # dal seme del chiamante, non dal numero di processi
+    num_prove = len(clausole_per_prova)
+    semi = generatore_casuale.integers(0, 2**31 - 1, size=num_prove).tolist()
+    if executor is None:
+        return (_esegui_esperimento(num_var, m_clausole, euristiche_attive, usa_minisat, usa_watched_literals,
+                                    nome_solutore, usa_bitset, seme)
+                for m_clausole, seme in zip(clausole_per_prova, semi))
+    
+    return executor.map(_esegui_esperimento, [num_var] * num_prove, clausole_per_prova,
+                        [euristiche_attive] * num_prove, [usa_minisat] * num_prove,
+                        [usa_watched_literals] * num_prove, [nome_solutore] * num_prove, [usa_bitset] * num_prove, semi,
+                        chunksize=max(1, num_prove // (4 * workers)))
+
+
+def test_probabilita_soddisfacibilita(num_var, lista_num_clausole, num_esperimenti, euristiche_attive, usa_minisat=False,
+                                      usa_watched_literals=False, workers=1, prove=None, nome_solutore='minisat22',
+                                      usa_bitset=False):
+    """Testa la probabilità di soddisfacibilità per diversi rapporti clausole/variabili.
+    
+    Con workers > 1 gli esperimenti indipendenti di tutti i rapporti sono distribuiti su più processi.
+    Se prove è una lista, vi aggiunge anche le singole prove (rapporto, tempo, soddisfacibile), in ordine
+    di rapporto, così la distribuzione dei tempi può riusarle invece di risolvere nuove formule.
+    """
     rapporti_m_n = []
     percentuali_soddisfatte = []
     tempi_esecuzione = []
     
-    for m_clausole in lista_num_clausole:
-        rapporto_corrente = m_clausole / num_var
-        rapporti_m_n.append(rapporto_corrente)
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        risultati = _esegui_esperimenti(executor, workers, num_var, lista_num_clausole, num_esperimenti,
+                                        euristiche_attive, usa_minisat, usa_watched_literals, nome_solutore,
+                                        usa_bitset)
         
-        contatore_soddisfatte = 0
-        tempo_totale = 0
-        
-        for _ in range(num_esperimenti):
-            formula_test = genera_formula_3sat(num_var, m_clausole)
+        for m_clausole in lista_num_clausole:
+            rapporto_corrente = m_clausole / num_var
+            rapporti_m_n.append(rapporto_corrente)
             
-            inizio_tempo = timer()
-            risultato_sat = verifica_soddisfacibilita(formula_test, num_var, euristiche_attive, False, usa_minisat)
-            fine_tempo = timer()
+            contatore_soddisfatte = 0
+            tempo_totale = 0
             
-            tempo_totale += (fine_tempo - inizio_tempo)
+            for tempo, soddisfatta in islice(risultati, num_esperimenti):
+                tempo_totale += tempo
+                
+                if soddisfatta:
+                    contatore_soddisfatte += 1
+                
+                if prove is not None:
+                    prove.append((rapporto_corrente, tempo, soddisfatta))
             
-            if risultato_sat is not None:
-                contatore_soddisfatte += 1
-        
-        tempo_medio = tempo_totale / num_esperimenti
-        percentuale_soddisfatta = (contatore_soddisfatte / num_esperimenti) * 100
-        
-        solver_name = "MiniSAT" if usa_minisat else ("SAT+Euristiche" if euristiche_attive else "SAT")
-        print(f"[{solver_name}] N: {num_var}, Rapporto: {rapporto_corrente:.2f}, Tempo medio: {tempo_medio:.6f}s")
-        
-        tempi_esecuzione.append(tempo_medio)
-        percentuali_soddisfatte.append(percentuale_soddisfatta)
+            tempo_medio = tempo_totale / num_esperimenti
+            percentuale_soddisfatta = (contatore_soddisfatte / num_esperimenti) * 100
+            
+            solver_name = nome_cdcl(nome_solutore) if usa_minisat else (
+                ("SAT-WL" if usa_watched_literals else "SAT-BIT" if usa_bitset else "SAT") +
+                ("+Euristiche" if euristiche_attive else ""))
+            print(f"[{solver_name}] N: {num_var}, Rapporto: {rapporto_corrente:.2f}, Tempo medio: {tempo_medio:.6f}s")
+            
+            tempi_esecuzione.append(tempo_medio)
+            percentuali_soddisfatte.append(percentuale_soddisfatta)
     
     return rapporti_m_n, percentuali_soddisfatte, tempi_esecuzione
 
 
-def analisi_distribuzione_soddisfacibilita(num_var, lista_num_clausole, punti_per_rapporto, euristiche_attive, usa_minisat=False):
+def analisi_distribuzione_soddisfacibilita(num_var, lista_num_clausole, punti_per_rapporto, euristiche_attive, usa_minisat=False,
+                                           usa_watched_literals=False, workers=1, nome_solutore='minisat22',
+                                           usa_bitset=False):
     """Analizza la distribuzione dei tempi di esecuzione per ogni singolo test."""
     rapporti_tutti = []
     tempi_tutti = []
     risultati_sat = []
     
-    for m_clausole in lista_num_clausole:
-        rapporto_corrente = m_clausole / num_var
-        solver_name = "MiniSAT" if usa_minisat else ("SAT+Euristiche" if euristiche_attive else "SAT")
-        print(f"[{solver_name}] Rapporto corrente: {rapporto_corrente:.2f}")
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        risultati = _esegui_esperimenti(executor, workers, num_var, lista_num_clausole, punti_per_rapporto,
+                                        euristiche_attive, usa_minisat, usa_watched_literals, nome_solutore,
+                                        usa_bitset)
         
-        for _ in range(punti_per_rapporto):
-            formula_test = genera_formula_3sat(num_var, m_clausole)
-            
-            inizio_tempo = timer()
-            risultato_sat = verifica_soddisfacibilita(formula_test, num_var, euristiche_attive, False, usa_minisat)
-            fine_tempo = timer()
+        for m_clausole in lista_num_clausole:
+            rapporto_corrente = m_clausole / num_var
+            solver_name = nome_cdcl(nome_solutore) if usa_minisat else (
+                ("SAT-WL" if usa_watched_literals else "SAT-BIT" if usa_bitset else "SAT") +
+                ("+Euristiche" if euristiche_attive else ""))
+            print(f"[{solver_name}] Rapporto corrente: {rapporto_corrente:.2f}")
             
-            rapporti_tutti.append(rapporto_corrente)
-            tempi_tutti.append(fine_tempo - inizio_tempo)
-            
-            if risultato_sat is not None:
-                risultati_sat.append(1)
-            else:
-                risultati_sat.append(0)
+            for tempo, soddisfatta in islice(risultati, punti_per_rapporto):
+                rapporti_tutti.append(rapporto_corrente)
+                tempi_tutti.append(tempo)
+                
+                if soddisfatta:
+                    risultati_sat.append(1)
+                else:
+                    risultati_sat.append(0)
     
     return rapporti_tutti, tempi_tutti, risultati_sat
 
 
 if __name__ == "__main__":
+    # matplotlib importato solo qui: chi importa il modulo (e i processi worker) non ne paga il costo
+    import matplotlib
+    matplotlib.use('Agg')  # Usa backend non-interattivo per evitare errori Qt/Wayland
+    import matplotlib.pyplot as plt
     
     debug_attivo = False
     euristiche_abilitate = True
     use_minisat = True  # NUOVA VARIABILE PER ATTIVARE MINISAT
+    use_watched_literals = False  # DPLL con two-watched literals (ignorato se use_minisat)
+    use_bitset = False  # Backtracking su maschere di bit, N < 64 (ignorato se use_minisat o use_watched_literals)
+    # Solutore CDCL di python-sat usato con use_minisat (ad es. 'glucose4', 'cadical195')
+    solutore_cdcl = 'minisat22'
+    nome_solutore_cdcl = nome_cdcl(solutore_cdcl)  # Per titoli e nomi dei file
+    # Esperimenti indipendenti distribuiti su più processi (1 = in serie). I tempi misurati con più processi
+    # risentono della contesa per cache e frequenza: usare più processi solo per le probabilità SAT
+    processi = 1
     
     if use_minisat:
         # Parametri ottimizzati per MiniSAT (più veloce)
@@ -343,6 +854,12 @@ if __name__ == "__main__":
     genera_grafico_probabilita = True
     genera_grafico_distribuzione = True
     
+    # Prove del grafico di probabilità con N = variabili_per_test_dettagliato, riusate per la distribuzione
+    prove_dettagliate = []
+    
+    # Una sola figura per tutti i grafici: gli assi vengono svuotati dopo ogni salvataggio
+    figura, assi = plt.subplots()
+    
     if genera_grafico_probabilita:
         indice_colore = 0
         rapporti_salvati = []
@@ -350,21 +867,34 @@ if __name__ == "__main__":
         
         for variabili in valori_n_variabili:
             clausole_da_testare = np.arange(variabili, (variabili * 9) + 1, int(variabili / 10))
+            prove = prove_dettagliate if variabili == variabili_per_test_dettagliato else None
             rapporti, percentuali, tempi = test_probabilita_soddisfacibilita(variabili, clausole_da_testare, 
-                                                                           numero_test, euristiche_abilitate, use_minisat)
+                                                                           numero_test, euristiche_abilitate, use_minisat,
+                                                                           use_watched_literals, processi, prove,
+                                                                           solutore_cdcl, use_bitset)
             
             tempi_salvati.append(tempi)
             rapporti_salvati.append(rapporti)
             
-            plt.scatter(rapporti, percentuali, color=palette_colori[indice_colore], s=25, alpha=0.5, 
+            assi.scatter(rapporti, percentuali, color=palette_colori[indice_colore], s=25, alpha=0.5, 
                        label=f"N = {variabili}")
             indice_colore += 1
         
         # Titolo e nome file basati sul solver utilizzato
         if use_minisat:
-            titolo_prob = 'Percentuale soddisfacibili con MiniSAT'
-            nome_file_prob = 'output/plt_prob_MiniSAT.png'
-            nome_file_prob_pdf = 'output/plt_prob_MiniSAT.pdf'
+            titolo_prob = f'Percentuale soddisfacibili con {nome_solutore_cdcl}'
+            nome_file_prob = f'output/plt_prob_{nome_solutore_cdcl}.png'
+            nome_file_prob_pdf = f'output/plt_prob_{nome_solutore_cdcl}.pdf'
+        elif use_watched_literals:
+            suffisso_wl = '_WL_H' if euristiche_abilitate else '_WL'
+            titolo_prob = f"Percentuale soddisfacibili con Watched Literals{' ed Euristiche' if euristiche_abilitate else ''}"
+            nome_file_prob = f'output/plt_prob{suffisso_wl}.png'
+            nome_file_prob_pdf = f'output/plt_prob{suffisso_wl}.pdf'
+        elif use_bitset:
+            suffisso_bit = '_BIT_H' if euristiche_abilitate else '_BIT'
+            titolo_prob = f"Percentuale soddisfacibili con Bitset{' ed Euristiche' if euristiche_abilitate else ''}"
+            nome_file_prob = f'output/plt_prob{suffisso_bit}.png'
+            nome_file_prob_pdf = f'output/plt_prob{suffisso_bit}.pdf'
         elif euristiche_abilitate:
             titolo_prob = 'Percentuale soddisfacibili con Euristiche'
             nome_file_prob = 'output/plt_prob_H.png'
@@ -374,30 +904,40 @@ if __name__ == "__main__":
             nome_file_prob = 'output/plt_prob.png'
             nome_file_prob_pdf = 'output/plt_prob.pdf'
         
-        plt.title(titolo_prob)
-        plt.xlabel('Rapporto Test M/N')
-        plt.ylabel('Percentuale soddisfacibili')
-        plt.grid(True)
-        plt.legend()
-        plt.ylim(0, 100)
-        plt.xlim(1, 9)
-        plt.xticks(range(1, 10, 1))
+        assi.set_title(titolo_prob)
+        assi.set_xlabel('Rapporto Test M/N')
+        assi.set_ylabel('Percentuale soddisfacibili')
+        assi.grid(True)
+        assi.legend()
+        assi.set_ylim(0, 100)
+        assi.set_xlim(1, 9)
+        assi.set_xticks(range(1, 10, 1))
         
-        plt.savefig(nome_file_prob)
-        plt.savefig(nome_file_prob_pdf)
-        plt.close()
+        figura.savefig(nome_file_prob)
+        figura.savefig(nome_file_prob_pdf)
+        assi.clear()
         
         # Grafico tempi di esecuzione
         indice_colore = 0
         for idx in range(len(tempi_salvati)):
-            plt.scatter(rapporti_salvati[idx], tempi_salvati[idx], color=palette_colori[indice_colore], 
+            assi.scatter(rapporti_salvati[idx], tempi_salvati[idx], color=palette_colori[indice_colore], 
                        s=25, alpha=0.5, label=f"N = {valori_n_variabili[idx]}")
             indice_colore += 1
         
         if use_minisat:
-            titolo_tempi = 'Tempi di esecuzione medi con MiniSAT'
-            nome_file_tempi = 'output/plt_times_MiniSAT.png'
-            nome_file_tempi_pdf = 'output/plt_times_MiniSAT.pdf'
+            titolo_tempi = f'Tempi di esecuzione medi con {nome_solutore_cdcl}'
+            nome_file_tempi = f'output/plt_times_{nome_solutore_cdcl}.png'
+            nome_file_tempi_pdf = f'output/plt_times_{nome_solutore_cdcl}.pdf'
+        elif use_watched_literals:
+            suffisso_wl = '_WL_H' if euristiche_abilitate else '_WL'
+            titolo_tempi = f"Tempi di esecuzione medi con Watched Literals{' ed Euristiche' if euristiche_abilitate else ''}"
+            nome_file_tempi = f'output/plt_times{suffisso_wl}.png'
+            nome_file_tempi_pdf = f'output/plt_times{suffisso_wl}.pdf'
+        elif use_bitset:
+            suffisso_bit = '_BIT_H' if euristiche_abilitate else '_BIT'
+            titolo_tempi = f"Tempi di esecuzione medi con Bitset{' ed Euristiche' if euristiche_abilitate else ''}"
+            nome_file_tempi = f'output/plt_times{suffisso_bit}.png'
+            nome_file_tempi_pdf = f'output/plt_times{suffisso_bit}.pdf'
         elif euristiche_abilitate:
             titolo_tempi = 'Tempi di esecuzione medi con Euristiche'
             nome_file_tempi = 'output/plt_times_H.png'
@@ -407,34 +947,55 @@ if __name__ == "__main__":
             nome_file_tempi = 'output/plt_times.png'
             nome_file_tempi_pdf = 'output/plt_times.pdf'
         
-        plt.title(titolo_tempi)
-        plt.xlabel('Rapporto Test M/N')
-        plt.ylabel('Tempi di esecuzione medi')
-        plt.grid(True)
-        plt.legend()
-        plt.xlim(1, 9)
-        plt.xticks(range(1, 10, 1))
+        assi.set_title(titolo_tempi)
+        assi.set_xlabel('Rapporto Test M/N')
+        assi.set_ylabel('Tempi di esecuzione medi')
+        assi.grid(True)
+        assi.legend()
+        assi.set_xlim(1, 9)
+        assi.set_xticks(range(1, 10, 1))
         
-        plt.savefig(nome_file_tempi)
-        plt.savefig(nome_file_tempi_pdf)
-        plt.close()
+        figura.savefig(nome_file_tempi)
+        figura.savefig(nome_file_tempi_pdf)
+        assi.clear()
     
     if genera_grafico_distribuzione:
         clausole_dettagliate = np.arange(variabili_per_test_dettagliato, 
                                        (variabili_per_test_dettagliato * 9) + 1, 
                                        int(variabili_per_test_dettagliato / 10))
         
-        rapporti_dist, tempi_dist, risultati_dist = analisi_distribuzione_soddisfacibilita(
-            variabili_per_test_dettagliato, clausole_dettagliate, punti_per_rapporto, euristiche_abilitate, use_minisat)
+        if prove_dettagliate and punti_per_rapporto <= numero_test:
+            # Stessi N e rapporti già provati per il grafico di probabilità: bastano le prime punti_per_rapporto prove
+            prove_riusate = [prova for indice, prova in enumerate(prove_dettagliate)
+                             if indice % numero_test < punti_per_rapporto]
+            rapporti_dist = [rapporto for rapporto, _, _ in prove_riusate]
+            tempi_dist = [tempo for _, tempo, _ in prove_riusate]
+            risultati_dist = [1 if soddisfatta else 0 for _, _, soddisfatta in prove_riusate]
+        else:
+            rapporti_dist, tempi_dist, risultati_dist = analisi_distribuzione_soddisfacibilita(
+                variabili_per_test_dettagliato, clausole_dettagliate, punti_per_rapporto, euristiche_abilitate, use_minisat,
+                use_watched_literals, processi, solutore_cdcl, use_bitset)
         
-        for i in range(len(rapporti_dist)):
-            colore_punto = "royalblue" if risultati_dist[i] == 1 else "orangered"
-            plt.scatter(rapporti_dist[i], tempi_dist[i], color=colore_punto, s=18, alpha=0.60)
+        # Un solo scatter per tutti i punti, colorati per esito (SAT blu, UNSAT arancio)
+        colori_punti = np.where(np.array(risultati_dist) == 1, "royalblue", "orangered")
+        assi.scatter(rapporti_dist, tempi_dist, c=colori_punti, s=18, alpha=0.60)
         
         if use_minisat:
-            titolo_dist = f'Tempo di esecuzione N = {variabili_per_test_dettagliato} con MiniSAT'
-            nome_file_sat = 'output/plt_sat_MiniSAT.png'
-            nome_file_sat_pdf = 'output/plt_sat_MiniSAT.pdf'
+            titolo_dist = f'Tempo di esecuzione N = {variabili_per_test_dettagliato} con {nome_solutore_cdcl}'
+            nome_file_sat = f'output/plt_sat_{nome_solutore_cdcl}.png'
+            nome_file_sat_pdf = f'output/plt_sat_{nome_solutore_cdcl}.pdf'
+        elif use_watched_literals:
+            suffisso_wl = '_WL_H' if euristiche_abilitate else '_WL'
+            titolo_dist = (f'Tempo di esecuzione N = {variabili_per_test_dettagliato} con Watched Literals'
+                           f"{' ed Euristiche' if euristiche_abilitate else ''}")
+            nome_file_sat = f'output/plt_sat{suffisso_wl}.png'
+            nome_file_sat_pdf = f'output/plt_sat{suffisso_wl}.pdf'
+        elif use_bitset:
+            suffisso_bit = '_BIT_H' if euristiche_abilitate else '_BIT'
+            titolo_dist = (f'Tempo di esecuzione N = {variabili_per_test_dettagliato} con Bitset'
+                           f"{' ed Euristiche' if euristiche_abilitate else ''}")
+            nome_file_sat = f'output/plt_sat{suffisso_bit}.png'
+            nome_file_sat_pdf = f'output/plt_sat{suffisso_bit}.pdf'
         elif euristiche_abilitate:
             titolo_dist = f'Tempo di esecuzione N = {variabili_per_test_dettagliato} con Euristiche'
             nome_file_sat = 'output/plt_sat_H.png'
@@ -444,20 +1005,26 @@ if __name__ == "__main__":
             nome_file_sat = 'output/plt_sat.png'
             nome_file_sat_pdf = 'output/plt_sat.pdf'
         
-        plt.title(titolo_dist)
-        plt.xlabel('Rapporto Test M/N')
-        plt.ylabel('Tempo di esecuzione')
-        plt.grid(True)
-        plt.xlim(1, 9)
-        plt.xticks(range(1, 10, 1))
+        assi.set_title(titolo_dist)
+        assi.set_xlabel('Rapporto Test M/N')
+        assi.set_ylabel('Tempo di esecuzione')
+        assi.grid(True)
+        assi.set_xlim(1, 9)
+        assi.set_xticks(range(1, 10, 1))
         
-        plt.savefig(nome_file_sat)
-        plt.savefig(nome_file_sat_pdf)
-        plt.close()
+        figura.savefig(nome_file_sat)
+        figura.savefig(nome_file_sat_pdf)
+        assi.clear()
+    
+    plt.close(figura)
 
     print("Analisi completata!")
     if use_minisat:
-        print("Risultati MiniSAT salvati con suffisso '_MiniSAT'")
+        print(f"Risultati {nome_solutore_cdcl} salvati con suffisso '_{nome_solutore_cdcl}'")
+    elif use_watched_literals:
+        print(f"Risultati Watched Literals salvati con suffisso '{'_WL_H' if euristiche_abilitate else '_WL'}'")
+    elif use_bitset:
+        print(f"Risultati Bitset salvati con suffisso '{'_BIT_H' if euristiche_abilitate else '_BIT'}'")
     elif euristiche_abilitate:
         print("Risultati con euristiche salvati con suffisso '_H'")
     else:
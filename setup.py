@@ -0,0 +1,19 @@
+"""Compila il solver a backtracking in C: python setup.py build_ext --inplace"""
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+import numpy as np
+
+estensioni = [
+    Extension(
+        "solver_core",
+        ["solver_core.pyx"],
+        include_dirs=[np.get_include()],
+        define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+        extra_compile_args=["-O3", "-march=native"],
+    )
+]
+
+setup(
+    name="solver_core",
+    ext_modules=cythonize(estensioni, compiler_directives={"language_level": "3"}),
+)
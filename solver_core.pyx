@@ -0,0 +1,222 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Versione compilata del solver a backtracking di main.py (risolvi_con_backtracking).
+
+Stesso algoritmo: formula CSR semplificata sul posto, con trail degli eventi annullato al backtracking.
+I letterali puri vengono eliminati solo alla radice: contarli a ogni nodo costa più di quanto fanno risparmiare.
+Compilare con: python setup.py build_ext --inplace
+"""
+import numpy as np
+cimport numpy as cnp
+
+cnp.import_array()
+
+# Tipi di evento sul trail
+cdef enum:
+    EVENTO_VARIABILE = 0
+    EVENTO_CLAUSOLA = 1
+    EVENTO_LETTERALE = 2
+
+
+cdef class _Solver:
+    cdef int num_variabili, num_clausole, num_soddisfatte, lunghezza_trail, testa_coda, fine_coda
+    cdef bint usa_euristiche
+    cdef const int[::1] letterali
+    cdef const int[::1] inizi
+    cdef int[::1] clausola_di
+    cdef int[::1] inizi_occorrenze    # Occorrenze del letterale lit in posizioni[inizi_occ[lit+n]:inizi_occ[lit+n+1]]
+    cdef int[::1] posizioni_occorrenze
+    cdef char[::1] clausola_soddisfatta
+    cdef char[::1] letterale_vivo
+    cdef int[::1] letterali_vivi
+    cdef int[::1] somma_vivi          # Somma dei letterali rimasti: con uno solo è il letterale stesso
+    cdef signed char[::1] assegnamento
+    cdef int[::1] tipo_trail
+    cdef int[::1] indice_trail
+    cdef int[::1] coda_unitarie       # Clausole diventate unitarie, ancora da propagare
+    cdef int[::1] ordine              # Variabili di decisione, nell'ordine di main.ordine_decisioni
+
+    def __init__(self, const int[::1] letterali, const int[::1] inizi, int num_variabili, bint usa_euristiche):
+        cdef int k, c, p, num_letterali = letterali.shape[0]
+        self.letterali = letterali
+        self.inizi = inizi
+        self.num_variabili = num_variabili
+        self.num_clausole = inizi.shape[0] - 1
+        self.usa_euristiche = usa_euristiche
+
+        self.clausola_di = np.empty(num_letterali, dtype=np.int32)
+        self.letterali_vivi = np.empty(self.num_clausole, dtype=np.int32)
+        self.somma_vivi = np.zeros(self.num_clausole, dtype=np.int32)
+        for c in range(self.num_clausole):
+            self.letterali_vivi[c] = inizi[c + 1] - inizi[c]
+            for p in range(inizi[c], inizi[c + 1]):
+                self.clausola_di[p] = c
+                self.somma_vivi[c] += letterali[p]
+
+        # Occorrenze raggruppate per letterale (counting sort sulle posizioni)
+        self.inizi_occorrenze = np.zeros(2 * num_variabili + 2, dtype=np.int32)
+        self.posizioni_occorrenze = np.empty(num_letterali, dtype=np.int32)
+        for p in range(num_letterali):
+            self.inizi_occorrenze[letterali[p] + num_variabili + 1] += 1
+        for k in range(2 * num_variabili + 1):
+            self.inizi_occorrenze[k + 1] += self.inizi_occorrenze[k]
+        cdef int[::1] riempimento = np.array(self.inizi_occorrenze[:2 * num_variabili + 1], dtype=np.int32)
+        for p in range(num_letterali):
+            k = letterali[p] + num_variabili
+            self.posizioni_occorrenze[riempimento[k]] = p
+            riempimento[k] += 1
+
+        self.clausola_soddisfatta = np.zeros(self.num_clausole, dtype=np.int8)
+        self.letterale_vivo = np.ones(num_letterali, dtype=np.int8)
+        self.assegnamento = np.zeros(num_variabili + 1, dtype=np.int8)
+        self.num_soddisfatte = 0
+
+        # Lungo un cammino ogni variabile, clausola e letterale entra nel trail al più una volta
+        self.tipo_trail = np.empty(num_variabili + self.num_clausole + num_letterali, dtype=np.int32)
+        self.indice_trail = np.empty(num_variabili + self.num_clausole + num_letterali, dtype=np.int32)
+        self.lunghezza_trail = 0
+        # Fra due svuotamenti ogni clausola entra in coda all'inizio o quando perde un letterale
+        self.coda_unitarie = np.empty(self.num_clausole + num_letterali, dtype=np.int32)
+        self.testa_coda = 0
+        self.fine_coda = 0
+
+        # Con le euristiche ordine statico di Jeroslow-Wang: somma di 2^-|clausola| sulle clausole della variabile
+        cdef double[::1] punteggio = np.zeros(num_variabili, dtype=np.float64)
+        if usa_euristiche:
+            for p in range(num_letterali):
+                c = self.clausola_di[p]
+                punteggio[abs(letterali[p]) - 1] -= 0.5 ** (inizi[c + 1] - inizi[c])
+        self.ordine = np.argsort(punteggio, kind='stable').astype(np.int32) + 1
+
+        if usa_euristiche:
+            for c in range(self.num_clausole):
+                if self.letterali_vivi[c] == 1:
+                    self.coda_unitarie[self.fine_coda] = c
+                    self.fine_coda += 1
+
+    cdef inline void _registra(self, int tipo, int indice):
+        self.tipo_trail[self.lunghezza_trail] = tipo
+        self.indice_trail[self.lunghezza_trail] = indice
+        self.lunghezza_trail += 1
+
+    cdef bint _assegna(self, int letterale):
+        """Rende vero il letterale; restituisce True se una clausola resta vuota."""
+        cdef int k, p, c, variabile = letterale if letterale > 0 else -letterale
+        self.assegnamento[variabile] = 1 if letterale > 0 else -1
+        self._registra(EVENTO_VARIABILE, variabile)
+
+        # Clausole soddisfatte dal letterale vero
+        k = letterale + self.num_variabili
+        for p in range(self.inizi_occorrenze[k], self.inizi_occorrenze[k + 1]):
+            c = self.clausola_di[self.posizioni_occorrenze[p]]
+            if not self.clausola_soddisfatta[c]:
+                self.clausola_soddisfatta[c] = 1
+                self.num_soddisfatte += 1
+                self._registra(EVENTO_CLAUSOLA, c)
+
+        # Letterali falsi rimossi dalle clausole non soddisfatte
+        k = -letterale + self.num_variabili
+        for p in range(self.inizi_occorrenze[k], self.inizi_occorrenze[k + 1]):
+            c = self.clausola_di[self.posizioni_occorrenze[p]]
+            if self.letterale_vivo[self.posizioni_occorrenze[p]] and not self.clausola_soddisfatta[c]:
+                self.letterale_vivo[self.posizioni_occorrenze[p]] = 0
+                self.letterali_vivi[c] -= 1
+                self.somma_vivi[c] += letterale  # Toglie -letterale
+                self._registra(EVENTO_LETTERALE, self.posizioni_occorrenze[p])
+                if self.letterali_vivi[c] == 0:
+                    return True
+                if self.letterali_vivi[c] == 1 and self.usa_euristiche:
+                    self.coda_unitarie[self.fine_coda] = c
+                    self.fine_coda += 1
+        return False
+
+    cdef void _elimina_puri(self):
+        """Assegna i letterali puri (una sola polarità nelle clausole non soddisfatte), fino al punto fisso."""
+        cdef int p, c, v, num_puri = 1
+        cdef int[::1] occorrenze = np.empty(2 * self.num_variabili + 1, dtype=np.int32)
+        while num_puri > 0:
+            occorrenze[:] = 0
+            for c in range(self.num_clausole):
+                if not self.clausola_soddisfatta[c]:
+                    for p in range(self.inizi[c], self.inizi[c + 1]):
+                        occorrenze[self.letterali[p] + self.num_variabili] += 1
+            num_puri = 0
+            for v in range(1, self.num_variabili + 1):
+                if self.assegnamento[v] == 0 and (occorrenze[self.num_variabili + v] > 0) != (occorrenze[self.num_variabili - v] > 0):
+                    self._assegna(v if occorrenze[self.num_variabili + v] > 0 else -v)  # Non svuota clausole
+                    num_puri += 1
+
+    cdef void _annulla(self, int lunghezza_trail):
+        """Ripristina lo stato ripercorrendo il trail all'indietro."""
+        cdef int tipo, indice
+        while self.lunghezza_trail > lunghezza_trail:
+            self.lunghezza_trail -= 1
+            tipo = self.tipo_trail[self.lunghezza_trail]
+            indice = self.indice_trail[self.lunghezza_trail]
+            if tipo == EVENTO_VARIABILE:
+                self.assegnamento[indice] = 0
+            elif tipo == EVENTO_CLAUSOLA:
+                self.clausola_soddisfatta[indice] = 0
+                self.num_soddisfatte -= 1
+            else:
+                self.letterale_vivo[indice] = 1
+                self.letterali_vivi[self.clausola_di[indice]] += 1
+                self.somma_vivi[self.clausola_di[indice]] += self.letterali[indice]
+        # Le clausole in coda si riferivano allo stato annullato
+        self.testa_coda = 0
+        self.fine_coda = 0
+
+    cdef bint _ricerca(self, int posizione):
+        cdef int c, k, variabile, letterale, inizio_nodo, inizio_tentativo
+
+        # Caso base: tutte le clausole soddisfatte -> soddisfacibile
+        if self.num_soddisfatte == self.num_clausole:
+            return True
+
+        inizio_nodo = self.lunghezza_trail
+
+        if self.usa_euristiche:
+            # Propagazione Unitaria con la coda delle clausole diventate unitarie, fino al punto fisso
+            while self.testa_coda < self.fine_coda:
+                c = self.coda_unitarie[self.testa_coda]
+                self.testa_coda += 1
+                if self.clausola_soddisfatta[c] or self.letterali_vivi[c] != 1:
+                    continue  # Già soddisfatta da un letterale propagato prima
+                if self._assegna(self.somma_vivi[c]):
+                    self._annulla(inizio_nodo)
+                    return False
+
+            if self.num_soddisfatte == self.num_clausole:
+                return True
+
+        while posizione < self.num_variabili and self.assegnamento[self.ordine[posizione]] != 0:
+            posizione += 1
+        if posizione == self.num_variabili:
+            self._annulla(inizio_nodo)
+            return False
+        variabile = self.ordine[posizione]
+
+        for k in range(2):
+            letterale = variabile if k == 0 else -variabile  # Prima True, poi False
+            inizio_tentativo = self.lunghezza_trail
+            if not self._assegna(letterale):
+                if self._ricerca(posizione + 1):
+                    return True
+            self._annulla(inizio_tentativo)
+
+        self._annulla(inizio_nodo)
+        return False
+
+
+cpdef solve(const int[::1] letterali, const int[::1] inizi, int num_variabili, bint usa_euristiche=False):
+    """Risolve la formula CSR; restituisce l'array int8 degli assegnamenti (1, -1, 0) o None se insoddisfacibile."""
+    cdef int c
+    for c in range(inizi.shape[0] - 1):
+        if inizi[c + 1] == inizi[c]:
+            return None  # Clausola vuota presente -> insoddisfacibile
+
+    cdef _Solver solver = _Solver(letterali, inizi, num_variabili, usa_euristiche)
+    if usa_euristiche:
+        solver._elimina_puri()
+    if not solver._ricerca(0):
+        return None
+    return np.asarray(solver.assegnamento)
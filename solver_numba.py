@@ -0,0 +1,226 @@
+"""Versione Numba del solver a backtracking di main.py, usata quando solver_core.pyx non è compilato.
+
+Stesso algoritmo e stessa interfaccia di solver_core.solve: formula CSR semplificata sul posto, con trail
+degli eventi annullato al backtracking; la ricerca è iterativa, con uno stack esplicito delle decisioni.
+La prima chiamata compila le funzioni (poi restano in cache in __pycache__).
+"""
+import numpy as np
+from numba import njit
+
+# Tipi di evento sul trail
+EVENTO_VARIABILE = 0
+EVENTO_CLAUSOLA = 1
+EVENTO_LETTERALE = 2
+
+# Contatori dello stato, tenuti in un array per poterli aggiornare dalle funzioni ausiliarie
+SODDISFATTE = 0
+LUNGHEZZA_TRAIL = 1
+TESTA_CODA = 2
+FINE_CODA = 3
+
+
+@njit(cache=True)
+def _registra(tipo_trail, indice_trail, contatori, tipo, indice):
+    tipo_trail[contatori[LUNGHEZZA_TRAIL]] = tipo
+    indice_trail[contatori[LUNGHEZZA_TRAIL]] = indice
+    contatori[LUNGHEZZA_TRAIL] += 1
+
+
+@njit(cache=True)
+def _assegna(letterale, num_variabili, usa_euristiche, clausola_di, inizi_occorrenze, posizioni_occorrenze,
+             clausola_soddisfatta, letterale_vivo, letterali_vivi, somma_vivi, assegnamento,
+             tipo_trail, indice_trail, coda_unitarie, contatori):
+    """Rende vero il letterale; restituisce True se una clausola resta vuota."""
+    variabile = abs(letterale)
+    assegnamento[variabile] = 1 if letterale > 0 else -1
+    _registra(tipo_trail, indice_trail, contatori, EVENTO_VARIABILE, variabile)
+
+    # Clausole soddisfatte dal letterale vero
+    k = letterale + num_variabili
+    for p in range(inizi_occorrenze[k], inizi_occorrenze[k + 1]):
+        c = clausola_di[posizioni_occorrenze[p]]
+        if not clausola_soddisfatta[c]:
+            clausola_soddisfatta[c] = True
+            contatori[SODDISFATTE] += 1
+            _registra(tipo_trail, indice_trail, contatori, EVENTO_CLAUSOLA, c)
+
+    # Letterali falsi rimossi dalle clausole non soddisfatte
+    k = -letterale + num_variabili
+    for p in range(inizi_occorrenze[k], inizi_occorrenze[k + 1]):
+        posizione = posizioni_occorrenze[p]
+        c = clausola_di[posizione]
+        if letterale_vivo[posizione] and not clausola_soddisfatta[c]:
+            letterale_vivo[posizione] = False
+            letterali_vivi[c] -= 1
+            somma_vivi[c] += letterale  # Toglie -letterale
+            _registra(tipo_trail, indice_trail, contatori, EVENTO_LETTERALE, posizione)
+            if letterali_vivi[c] == 0:
+                return True
+            if letterali_vivi[c] == 1 and usa_euristiche:
+                coda_unitarie[contatori[FINE_CODA]] = c
+                contatori[FINE_CODA] += 1
+    return False
+
+
+@njit(cache=True)
+def _annulla(lunghezza_trail, letterali, clausola_di, clausola_soddisfatta, letterale_vivo, letterali_vivi,
+             somma_vivi, assegnamento, tipo_trail, indice_trail, contatori):
+    """Ripristina lo stato ripercorrendo il trail all'indietro."""
+    while contatori[LUNGHEZZA_TRAIL] > lunghezza_trail:
+        contatori[LUNGHEZZA_TRAIL] -= 1
+        tipo = tipo_trail[contatori[LUNGHEZZA_TRAIL]]
+        indice = indice_trail[contatori[LUNGHEZZA_TRAIL]]
+        if tipo == EVENTO_VARIABILE:
+            assegnamento[indice] = 0
+        elif tipo == EVENTO_CLAUSOLA:
+            clausola_soddisfatta[indice] = False
+            contatori[SODDISFATTE] -= 1
+        else:
+            letterale_vivo[indice] = True
+            letterali_vivi[clausola_di[indice]] += 1
+            somma_vivi[clausola_di[indice]] += letterali[indice]
+    # Le clausole in coda si riferivano allo stato annullato
+    contatori[TESTA_CODA] = 0
+    contatori[FINE_CODA] = 0
+
+
+@njit(cache=True)
+def _risolvi(letterali, inizi, num_variabili, usa_euristiche, assegnamento):
+    """Cerca un assegnamento che soddisfi la formula CSR (scritto in assegnamento); False se insoddisfacibile."""
+    num_letterali = letterali.shape[0]
+    num_clausole = inizi.shape[0] - 1
+
+    clausola_di = np.empty(num_letterali, dtype=np.int32)
+    letterali_vivi = np.empty(num_clausole, dtype=np.int32)
+    somma_vivi = np.zeros(num_clausole, dtype=np.int32)  # Con un solo letterale rimasto è il letterale stesso
+    for c in range(num_clausole):
+        letterali_vivi[c] = inizi[c + 1] - inizi[c]
+        for p in range(inizi[c], inizi[c + 1]):
+            clausola_di[p] = c
+            somma_vivi[c] += letterali[p]
+
+    # Occorrenze raggruppate per letterale (counting sort sulle posizioni)
+    inizi_occorrenze = np.zeros(2 * num_variabili + 2, dtype=np.int32)
+    posizioni_occorrenze = np.empty(num_letterali, dtype=np.int32)
+    for p in range(num_letterali):
+        inizi_occorrenze[letterali[p] + num_variabili + 1] += 1
+    for k in range(2 * num_variabili + 1):
+        inizi_occorrenze[k + 1] += inizi_occorrenze[k]
+    riempimento = inizi_occorrenze[:2 * num_variabili + 1].copy()
+    for p in range(num_letterali):
+        k = letterali[p] + num_variabili
+        posizioni_occorrenze[riempimento[k]] = p
+        riempimento[k] += 1
+
+    clausola_soddisfatta = np.zeros(num_clausole, dtype=np.bool_)
+    letterale_vivo = np.ones(num_letterali, dtype=np.bool_)
+    # Lungo un cammino ogni variabile, clausola e letterale entra nel trail al più una volta
+    tipo_trail = np.empty(num_variabili + num_clausole + num_letterali, dtype=np.int32)
+    indice_trail = np.empty(num_variabili + num_clausole + num_letterali, dtype=np.int32)
+    # Fra due svuotamenti ogni clausola entra in coda all'inizio o quando perde un letterale
+    coda_unitarie = np.empty(num_clausole + num_letterali, dtype=np.int32)
+    contatori = np.zeros(4, dtype=np.int64)
+
+    # Ordine delle decisioni: con le euristiche Jeroslow-Wang statico (come main.ordine_decisioni)
+    punteggio = np.zeros(num_variabili, dtype=np.float64)
+    if usa_euristiche:
+        for p in range(num_letterali):
+            c = clausola_di[p]
+            punteggio[abs(letterali[p]) - 1] -= 0.5 ** (inizi[c + 1] - inizi[c])
+    ordine = (np.argsort(punteggio, kind='mergesort') + 1).astype(np.int32)
+
+    if usa_euristiche:
+        for c in range(num_clausole):
+            if letterali_vivi[c] == 1:
+                coda_unitarie[contatori[FINE_CODA]] = c
+                contatori[FINE_CODA] += 1
+
+        # Letterali puri eliminati solo alla radice, come nella versione Cython
+        occorrenze = np.empty(2 * num_variabili + 1, dtype=np.int32)
+        num_puri = 1
+        while num_puri > 0:
+            occorrenze[:] = 0
+            for c in range(num_clausole):
+                if not clausola_soddisfatta[c]:
+                    for p in range(inizi[c], inizi[c + 1]):
+                        occorrenze[letterali[p] + num_variabili] += 1
+            num_puri = 0
+            for v in range(1, num_variabili + 1):
+                if assegnamento[v] == 0 and (occorrenze[num_variabili + v] > 0) != (occorrenze[num_variabili - v] > 0):
+                    _assegna(v if occorrenze[num_variabili + v] > 0 else -v, num_variabili, usa_euristiche,
+                             clausola_di, inizi_occorrenze, posizioni_occorrenze, clausola_soddisfatta,
+                             letterale_vivo, letterali_vivi, somma_vivi, assegnamento,
+                             tipo_trail, indice_trail, coda_unitarie, contatori)  # Non svuota clausole
+                    num_puri += 1
+
+    # Decisioni aperte: lunghezza del trail prima della decisione, posizione in ordine, False già provato
+    inizio_decisione = np.empty(num_variabili, dtype=np.int64)
+    posizione_decisione = np.empty(num_variabili, dtype=np.int32)
+    provato_false = np.zeros(num_variabili, dtype=np.bool_)
+    num_decisioni = 0
+    prossima_posizione = 0
+    conflitto = False
+
+    while True:
+        if conflitto:
+            # Backtracking: annulla fino all'ultima decisione con False ancora da provare
+            while num_decisioni > 0 and provato_false[num_decisioni - 1]:
+                num_decisioni -= 1
+            if num_decisioni == 0:
+                return False  # Insoddisfacibile
+            _annulla(inizio_decisione[num_decisioni - 1], letterali, clausola_di, clausola_soddisfatta,
+                     letterale_vivo, letterali_vivi, somma_vivi, assegnamento, tipo_trail, indice_trail, contatori)
+            provato_false[num_decisioni - 1] = True
+            prossima_posizione = posizione_decisione[num_decisioni - 1] + 1
+            conflitto = _assegna(-ordine[posizione_decisione[num_decisioni - 1]], num_variabili, usa_euristiche,
+                                 clausola_di, inizi_occorrenze, posizioni_occorrenze, clausola_soddisfatta,
+                                 letterale_vivo, letterali_vivi, somma_vivi, assegnamento,
+                                 tipo_trail, indice_trail, coda_unitarie, contatori)
+            continue
+
+        if usa_euristiche:
+            # Propagazione Unitaria con la coda delle clausole diventate unitarie, fino al punto fisso
+            while contatori[TESTA_CODA] < contatori[FINE_CODA] and not conflitto:
+                c = coda_unitarie[contatori[TESTA_CODA]]
+                contatori[TESTA_CODA] += 1
+                if clausola_soddisfatta[c] or letterali_vivi[c] != 1:
+                    continue  # Già soddisfatta da un letterale propagato prima
+                conflitto = _assegna(somma_vivi[c], num_variabili, usa_euristiche,
+                                     clausola_di, inizi_occorrenze, posizioni_occorrenze, clausola_soddisfatta,
+                                     letterale_vivo, letterali_vivi, somma_vivi, assegnamento,
+                                     tipo_trail, indice_trail, coda_unitarie, contatori)
+            if conflitto:
+                continue
+
+        # Caso base: tutte le clausole soddisfatte -> soddisfacibile
+        if contatori[SODDISFATTE] == num_clausole:
+            return True
+
+        while prossima_posizione < num_variabili and assegnamento[ordine[prossima_posizione]] != 0:
+            prossima_posizione += 1
+        if prossima_posizione == num_variabili:
+            conflitto = True
+            continue
+
+        inizio_decisione[num_decisioni] = contatori[LUNGHEZZA_TRAIL]
+        posizione_decisione[num_decisioni] = prossima_posizione
+        provato_false[num_decisioni] = False
+        num_decisioni += 1
+        conflitto = _assegna(ordine[prossima_posizione], num_variabili, usa_euristiche,
+                             clausola_di, inizi_occorrenze, posizioni_occorrenze, clausola_soddisfatta,
+                             letterale_vivo, letterali_vivi, somma_vivi, assegnamento,
+                             tipo_trail, indice_trail, coda_unitarie, contatori)
+        prossima_posizione += 1
+
+
+def solve(letterali, inizi, num_variabili, usa_euristiche=False):
+    """Risolve la formula CSR; restituisce l'array int8 degli assegnamenti (1, -1, 0) o None se insoddisfacibile."""
+    letterali = np.ascontiguousarray(letterali, dtype=np.int32)
+    inizi = np.ascontiguousarray(inizi, dtype=np.int32)
+    if np.any(np.diff(inizi) == 0):
+        return None  # Clausola vuota presente -> insoddisfacibile
+
+    assegnamento = np.zeros(num_variabili + 1, dtype=np.int8)
+    if not _risolvi(letterali, inizi, num_variabili, bool(usa_euristiche), assegnamento):
+        return None
+    return assegnamento